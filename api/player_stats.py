@@ -0,0 +1,147 @@
+"""
+Per-player performance aggregates, kept up to date as matches are saved.
+
+One row per (puuid, champion code, position, patch) holds running totals: games,
+wins, game duration, kills, deaths, assists and the last time it was
+played. save_match_data adds each new match as it is written to
+matches.csv, so dashboards read the rollups directly instead of reloading
+and grouping the whole match history. A match is only counted once per
+player, however often it is fetched again. Databases from before champion
+codes (keyed by champion name) are converted in place when first opened.
+
+    python api/player_stats.py <puuid>      # print a player's aggregates
+"""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# The champion registry lives with the scrapers
+sys.path.append(str(Path(__file__).resolve().parent.parent / "scraper"))
+from registry import registry
+
+STATS_FILE = os.getenv("PLAYER_STATS_DB", "player_stats.sqlite")
+
+COLUMNS = ["puuid", "champion", "position", "patch", "games", "wins", "duration",
+           "kills", "deaths", "assists", "last_played"]
+
+# PRAGMA user_version of the current layout; 0 is the name-keyed one
+SCHEMA_VERSION = 1
+
+CREATE_AGGREGATES = """
+    CREATE TABLE IF NOT EXISTS aggregates (
+        puuid TEXT, champion INTEGER, position TEXT, patch TEXT,
+        games INTEGER, wins INTEGER, duration INTEGER,
+        kills INTEGER, deaths INTEGER, assists INTEGER, last_played INTEGER,
+        PRIMARY KEY (puuid, champion, position, patch)
+    )
+"""
+
+# Adds a row's totals to the ones already kept for its key
+ADD_TOTALS = """
+    INSERT INTO aggregates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (puuid, champion, position, patch) DO UPDATE SET
+        games = games + excluded.games,
+        wins = wins + excluded.wins,
+        duration = duration + excluded.duration,
+        kills = kills + excluded.kills,
+        deaths = deaths + excluded.deaths,
+        assists = assists + excluded.assists,
+        last_played = MAX(last_played, excluded.last_played)
+"""
+
+def patch_from_version(game_version):
+    """"15.19.712.2468" -> "15.19" """
+    return ".".join(str(game_version).split(".")[:2])
+
+class PlayerStats:
+    def __init__(self, path=STATS_FILE):
+        self.db = sqlite3.connect(path)
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aggregates'"
+        ).fetchone()
+        if exists and version < 1:
+            self._migrate_champion_codes(path)
+        self.db.executescript(CREATE_AGGREGATES + """;
+            CREATE TABLE IF NOT EXISTS counted (
+                match_id TEXT, puuid TEXT,
+                PRIMARY KEY (match_id, puuid)
+            );
+        """)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _migrate_champion_codes(self, path):
+        """Re-key name-keyed aggregates by champion code, merging rows that meet on the same code"""
+        rows = self.db.execute("SELECT * FROM aggregates").fetchall()
+        codes = {row[1]: registry().code(row[1]) for row in rows}
+        unknown = sorted(str(name) for name, code in codes.items() if code is None)
+        if unknown:
+            # Dropping them would lose games the counted table never adds again
+            raise SystemExit(
+                f"❌ Unknown champions in {path}: {', '.join(unknown)}. "
+                "Run python scraper/registry.py update and try again."
+            )
+
+        print(f"🔄 Converting {len(rows)} player aggregates in {path} to champion codes...")
+        self.db.execute("BEGIN")
+        try:
+            self.db.execute("DROP TABLE aggregates")
+            self.db.execute(CREATE_AGGREGATES)
+            self.db.executemany(ADD_TOTALS, [(row[0], codes[row[1]]) + tuple(row[2:]) for row in rows])
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            raise
+
+    def add_match(self, match_id, info, participant):
+        """Fold one player's result in a match into their aggregates; returns False if already counted"""
+        key = (
+            participant.get("puuid"),
+            participant.get("championId") or registry().code(participant.get("championName")),
+            participant.get("teamPosition") or "NA",
+            patch_from_version(info.get("gameVersion", "NA")),
+        )
+        totals = (
+            1,
+            1 if participant.get("win") else 0,
+            info.get("gameDuration", 0),
+            participant.get("kills", 0),
+            participant.get("deaths", 0),
+            participant.get("assists", 0),
+            info.get("gameStartTimestamp", 0),
+        )
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO counted VALUES (?, ?)", (match_id, key[0])
+            )
+            if cursor.rowcount == 0:
+                return False
+            self.db.execute(ADD_TOTALS, key + totals)
+        return True
+
+    def get(self, puuid, champion=None, position=None, patch=None):
+        """A player's aggregates as a DataFrame, optionally narrowed down (champion by any spelling or code)"""
+        if champion is not None:
+            champion = registry().code(champion)
+        query = "SELECT * FROM aggregates WHERE puuid = ?"
+        params = [puuid]
+        for column, value in (("champion", champion), ("position", position), ("patch", patch)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        df = pd.DataFrame(self.db.execute(query, params).fetchall(), columns=COLUMNS)
+        df["win_rate"] = (df["wins"] / df["games"] * 100).round(1)
+        df["kda"] = ((df["kills"] + df["assists"]) / df["deaths"].clip(lower=1)).round(2)
+        df["avg_duration"] = (df["duration"] / df["games"]).round()
+        return df.sort_values(["games", "last_played"], ascending=False)
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        print(PlayerStats().get(sys.argv[1]).to_string(index=False))
+    else:
+        print(__doc__)
@@ -1,12 +1,20 @@
-import requests
 from dotenv import load_dotenv
 import os
+import sys
 import json
 import time
 import datetime
+import queue
+import threading
 from pathlib import Path
 import pandas as pd
-from collections import deque
+
+from player_stats import PlayerStats
+from scheduler import BACKFILL, INCREMENTAL, INTERACTIVE, RequestScheduler
+
+# The champion registry lives with the scrapers
+sys.path.append(str(Path(__file__).resolve().parent.parent / "scraper"))
+from registry import registry
 
 load_dotenv()
 
@@ -15,22 +23,47 @@ REGION_ROUTING = os.getenv("REGION_ROUTING")
 MATCH_REGION_ROUTING = os.getenv("MATCH_REGION_ROUTING")
 PLATFORM_ROUTING = os.getenv("PLATFORM_ROUTING")
 
-def get_puuid(game_name, tag_line):
-    url = f"https://{REGION_ROUTING}.api.riotgames.com/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}"
-    r = requests.get(url, params={"api_key" : RIOT_API_KEY})
+# RIOT_API_BASE=http://127.0.0.1:8766 sends every request to a local stand-in
+# (api/riot_stub.py) instead, with the routing value as the first path segment
+RIOT_API_BASE = os.getenv("RIOT_API_BASE")
+
+# Watch mode: seconds between active game checks for each rostered player,
+# and how long to keep asking match-v5 for a finished game
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", 60))
+MATCH_RETRY = float(os.getenv("MATCH_RETRY", 30))
+MATCH_WAIT = float(os.getenv("MATCH_WAIT", 30 * 60))
+
+# Every request shares one rate budget per host with any other process using
+# the key; lanes decide who goes first (interactive > incremental > backfill)
+scheduler = None
+
+def riot_get(url, params, lane):
+    global scheduler
+    if scheduler is None:
+        scheduler = RequestScheduler()
+    return scheduler.get(url, params, lane)
+
+def api_url(routing, path):
+    if RIOT_API_BASE:
+        return f"{RIOT_API_BASE.rstrip('/')}/{routing}{path}"
+    return f"https://{routing}.api.riotgames.com{path}"
+
+def get_puuid(game_name, tag_line, lane=INTERACTIVE):
+    url = api_url(REGION_ROUTING, f"/riot/account/v1/accounts/by-riot-id/{game_name}/{tag_line}")
+    r = riot_get(url, {"api_key" : RIOT_API_KEY}, lane)
     return r.json()["puuid"]
 
 #LEAGUE-V4
-def get_ranked_stats(puuid):
-    url = f"https://{PLATFORM_ROUTING}.api.riotgames.com/lol/league/v4/entries/by-puuid/{puuid}"
-    r = requests.get(url, params={"api_key" : RIOT_API_KEY})
+def get_ranked_stats(puuid, lane=INTERACTIVE):
+    url = api_url(PLATFORM_ROUTING, f"/lol/league/v4/entries/by-puuid/{puuid}")
+    r = riot_get(url, {"api_key" : RIOT_API_KEY}, lane)
     return r.json()
 
 #match-v5
-def get_match_ids(puuid):
+def get_match_ids(puuid, lane=INCREMENTAL):
     all_matches = []
     start = 0
-    url = f"https://{MATCH_REGION_ROUTING}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids"
+    url = api_url(MATCH_REGION_ROUTING, f"/lol/match/v5/matches/by-puuid/{puuid}/ids")
 
     while True:
         params = {
@@ -40,7 +73,7 @@ def get_match_ids(puuid):
             "count": 100,  # max per request
             "type": "ranked"
         }
-        r = requests.get(url, params=params)
+        r = riot_get(url, params, lane)
         match_ids = r.json()
     
         if not match_ids:  # no more matches
@@ -51,23 +84,35 @@ def get_match_ids(puuid):
         
     return all_matches
 
-def get_match(match_id):
-    wait_for_rate_limit(MATCH_REGION_ROUTING)
-    url = f"https://{MATCH_REGION_ROUTING}.api.riotgames.com/lol/match/v5/matches/{match_id}"
-    r = requests.get(url, params={"api_key": RIOT_API_KEY})
-    
-    if r.status_code == 429:
-        retry = int(r.headers.get("Retry-After", 120))
-        print(f"Rate limit hit, retrying in {retry}s...")
-        time.sleep(retry)
-        return get_match(match_id)
+def get_match(match_id, lane=BACKFILL):
+    url = api_url(MATCH_REGION_ROUTING, f"/lol/match/v5/matches/{match_id}")
+    r = riot_get(url, {"api_key": RIOT_API_KEY}, lane)
+    r.raise_for_status()
+    return r.json()
+
+def find_match(match_id, lane=INCREMENTAL):
+    """Match record, or None while match-v5 does not have it yet"""
+    url = api_url(MATCH_REGION_ROUTING, f"/lol/match/v5/matches/{match_id}")
+    r = riot_get(url, {"api_key": RIOT_API_KEY}, lane)
+    if r.status_code == 404:
+        return None
+    r.raise_for_status()
+    return r.json()
+
+#spectator-v5
+def get_active_game(puuid, lane=INCREMENTAL):
+    """The game a player is in right now, or None"""
+    url = api_url(PLATFORM_ROUTING, f"/lol/spectator/v5/active-games/by-summoner/{puuid}")
+    r = riot_get(url, {"api_key": RIOT_API_KEY}, lane)
+    if r.status_code == 404:
+        return None
     r.raise_for_status()
     return r.json()
 
 #champion-mastery-v4
-def get_champion_masteries(puuid):
-    url = f"https://{PLATFORM_ROUTING}.api.riotgames.com/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}"
-    r = requests.get(url, params={"api_key" : RIOT_API_KEY})
+def get_champion_masteries(puuid, lane=INTERACTIVE):
+    url = api_url(PLATFORM_ROUTING, f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}")
+    r = riot_get(url, {"api_key" : RIOT_API_KEY}, lane)
     return r.json()
 
 # utils
@@ -79,37 +124,6 @@ def save_to_json(file_name, data):
         json.dump(data, file, indent=4)
     print(f"{file_name} saved successfully")
 
-# --- Rate Limit Settings ---
-SHORT_LIMIT = 20
-SHORT_WINDOW = 1
-LONG_LIMIT = 100
-LONG_WINDOW = 120
-
-# Track request timestamps per region
-request_log = {MATCH_REGION_ROUTING: deque()}
-
-def wait_for_rate_limit(region):
-    now = time.time()
-    log = request_log[region]
-
-    # remove old timestamps outside long window
-    while log and now - log[0] > LONG_WINDOW:
-        log.popleft()
-    
-    # short-term check
-    recent_short = [t for t in log if now - t <= SHORT_WINDOW]
-    if len(recent_short) >= SHORT_LIMIT:
-        sleep_time = SHORT_WINDOW - (now - recent_short[0])
-        time.sleep(max(sleep_time, 0))
-
-    # long-term check
-    if len(log) >= LONG_LIMIT:
-        sleep_time = LONG_WINDOW - (now - log[0])
-        time.sleep(max(sleep_time, 0))
-
-    # record this request
-    log.append(time.time())
-
 def filter_match_data(match, info, participants):
 
     # flatten all 10 participants into column-wise structure
@@ -117,7 +131,7 @@ def filter_match_data(match, info, participants):
     for i, p in enumerate(participants, start=1):
         flattened.update({
             f"p{i}_teamId": p.get("teamId", None),
-            f"p{i}_championName": p.get("championName", "NA"),
+            f"p{i}_championId": p.get("championId") or registry().code(p.get("championName")),
             f"p{i}_teamPosition": p.get("teamPosition", "NA"),
         })
     
@@ -137,32 +151,73 @@ def filter_match_data(match, info, participants):
     
     return pd.concat([match.reset_index(drop=True), filtered_match.reset_index(drop=True)], axis=1)
 
-def save_match_data(match_ids, puuid, csv_file):
+def save_match_data(match_ids, puuid, csv_file, stats=None):
+    """Save each match of a player's history; returns the match ids that failed"""
+    failed = []
     for i, match_id in enumerate(match_ids):
         print(f"getting {i+1}/{len(match_ids)} match data for {puuid}")
-        match_data = get_match(match_id)
-        info = match_data.get("info", {})
-
-        # check if it is a full length game
-        if info.get("gameDuration", 0) < 1000:
-            print(f"skipping match id ({match_id}): game time too short ({info.get('gameDuration')})")
-            continue
+        try:
+            save_match(match_id, get_match(match_id), puuid, csv_file, stats)
+        except Exception as e:
+            # One bad match does not cost the rest of the history
+            print(f"⚠ could not save match {match_id}: {e}")
+            failed.append(match_id)
+    return failed
+
+def save_match(match_id, match_data, puuid, csv_file, stats=None):
+    """Append one match from a player's perspective to the CSV and their aggregates"""
+    info = match_data.get("info", {})
+
+    # check if it is a full length game
+    if info.get("gameDuration", 0) < 1000:
+        print(f"skipping match id ({match_id}): game time too short ({info.get('gameDuration')})")
+        return
+
+    participants = info.get("participants", [])
+
+    if participants:
+        match = pd.DataFrame([{
+            # 🧠 --- Match Context ---
+            "matchId": match_id,
+            "puuid": puuid,
+        }])
+
+        filtered_match = filter_match_data(match, info, participants)
+
+        # Append to CSV
+        filtered_match.to_csv(csv_file, mode='a', index=False,
+                header=not os.path.exists(csv_file))  # write header only once
+
+        # Fold the player's result into their running aggregates
+        if stats:
+            for p in participants:
+                if p.get("puuid") == puuid:
+                    stats.add_match(match_id, info, p)
+
+def upgrade_matches_csv(csv_file):
+    """Convert a matches CSV written with champion names (p<i>_championName) to champion codes"""
+    if not os.path.exists(csv_file):
+        return
+    with open(csv_file, encoding="utf-8") as f:
+        header = f.readline().rstrip("\n").split(",")
+    names = [column for column in header if column.endswith("_championName")]
+    if not names:
+        return
+
+    # Everything else is copied through as the text it was written as
+    df = pd.read_csv(csv_file, dtype=str, keep_default_na=False)
+    for column in names:
+        df[column] = registry().encode(df[column])
+    df = df.rename(columns={column: column.replace("_championName", "_championId") for column in names})
+    df.to_csv(csv_file + ".tmp", index=False)
+    os.replace(csv_file + ".tmp", csv_file)
+    print(f"🔁 Converted the champion names in {csv_file} ({len(df)} matches) to champion codes")
+
+def roster():
+    """Rostered players' (game name, tag line) from the .env"""
+    for i in range(1, 6):
+        yield os.getenv(f"GAME_NAME_{i}"), os.getenv(f"TAG_LINE_{i}")
 
-        participants = info.get("participants", [])
-        
-        if participants:
-            match = pd.DataFrame([{
-                # 🧠 --- Match Context ---
-                "matchId": match_id,
-                "puuid": puuid,
-            }])
-
-            filtered_match = filter_match_data(match, info, participants)
-
-            # Append to CSV
-            filtered_match.to_csv(csv_file, mode='a', index=False,
-                    header=not os.path.exists(csv_file))  # write header only once
-            
 # main
 def main():
     # create data folders
@@ -173,27 +228,129 @@ def main():
     ranked_stats_folder.mkdir(parents=True, exist_ok=True)
 
     csv_file = "matches.csv"
+    upgrade_matches_csv(csv_file)
+
+    # Match history is the long part: it is fetched in the background in the
+    # backfill lane while the other players are refreshed ahead of it
+    histories = queue.Queue()
+    failed = []
+    crashed = []
+
+    def backfill():
+        try:
+            stats = PlayerStats()
+            while (job := histories.get()) is not None:
+                match_ids, puuid = job
+                failed.extend(save_match_data(match_ids, puuid, csv_file, stats))
+        except Exception as e:
+            crashed.append(e)
+
+    worker = threading.Thread(target=backfill)
+    worker.start()
+
+    try:
+        for game_name, tag_line in roster():
+            puuid = get_puuid(game_name, tag_line, INCREMENTAL)
+            print(f"\ngetting data for {puuid}\n")
+
+            # save ranked stats data as json
+            ranked = get_ranked_stats(puuid, INCREMENTAL)
+            ranked_file_name = ranked_stats_folder / f"{puuid}.json"
+            save_to_json(ranked_file_name, ranked)
+
+            # save champ masteries data as json
+            cm = get_champion_masteries(puuid, INCREMENTAL)
+            cm_file_name = cm_folder / f"{puuid}.json"
+            save_to_json(cm_file_name, cm)
+
+            # save matches data as json
+            match_ids = get_match_ids(puuid)
+            histories.put((match_ids, puuid))
+    finally:
+        # Let the backfill finish what it has, even if the refresh failed
+        histories.put(None)
+        worker.join()
+
+    if crashed:
+        raise crashed[0]
+    if failed:
+        sys.exit(f"❌ {len(failed)} matches could not be saved: {', '.join(failed)}")
+
+def watch_once(puuids, in_game, pending, csv_file, stats):
+    """
+    One watch pass: check who is in a game and save the finished games whose
+    match record exists. in_game (puuid -> match id) and pending (match id ->
+    {"puuids", "ended", "next_try"}) carry over from one pass to the next.
+    """
+    for puuid in puuids:
+        try:
+            game = get_active_game(puuid)
+        except Exception as e:
+            # Keep what we knew about the player and ask again next interval
+            print(f"⚠ could not check {puuid}: {e}")
+            continue
+        match_id = f"{game['platformId']}_{game['gameId']}" if game else None
+        previous = in_game.get(puuid)
+        if previous and previous != match_id:
+            print(f"🏁 {puuid} finished {previous}")
+            now = time.time()
+            entry = pending.setdefault(previous, {"puuids": [], "ended": now, "next_try": now})
+            entry["puuids"].append(puuid)
+        elif match_id and not previous:
+            print(f"🎮 {puuid} is in {match_id}")
+        in_game[puuid] = match_id
+
+    # The match record shows up a few minutes after the game ends
+    for match_id, entry in list(pending.items()):
+        if time.time() < entry["next_try"]:
+            continue
+        players = len(entry["puuids"])
+        try:
+            match_data = find_match(match_id)
+            while match_data and entry["puuids"]:
+                save_match(match_id, match_data, entry["puuids"][0], csv_file, stats)
+                entry["puuids"].pop(0)  # saved, so not written again on a retry
+        except Exception as e:
+            # Transient API or disk errors: try again like a match that is not ready
+            print(f"⚠ could not save {match_id}: {e}")
+            match_data = None
+        if match_data:
+            print(f"✅ Saved {match_id} for {players} players")
+            del pending[match_id]
+        elif time.time() - entry["ended"] > MATCH_WAIT:
+            print(f"⚠ {match_id} never showed up in match-v5, giving up")
+            del pending[match_id]
+        else:
+            entry["next_try"] = time.time() + MATCH_RETRY
+
+def watch(csv_file="matches.csv"):
+    """
+    Append rostered players' games as they finish: poll each player's active
+    game, and once a game is over keep asking match-v5 for just that match
+    until the record exists.
+    """
+    upgrade_matches_csv(csv_file)
+    puuids = [get_puuid(game_name, tag_line, INCREMENTAL) for game_name, tag_line in roster()]
+    stats = PlayerStats()
+    in_game = {}
+    pending = {}
+    print(f"👀 Watching {len(puuids)} players every {WATCH_INTERVAL:.0f}s")
 
-    for i in range(1, 6):
-        game_name = os.getenv(f"GAME_NAME_{i}")
-        tag_line = os.getenv(f"TAG_LINE_{i}")
-        puuid = get_puuid(game_name, tag_line)
-        print(f"\ngetting data for {puuid}\n")
-
-        # save ranked stats data as json
-        ranked = get_ranked_stats(puuid)
-        ranked_file_name = ranked_stats_folder / f"{puuid}.json"
-        save_to_json(ranked_file_name, ranked)
-
-        # save champ masteries data as json
-        cm = get_champion_masteries(puuid)
-        cm_file_name = cm_folder / f"{puuid}.json"
-        save_to_json(cm_file_name, cm)
-
-        # save matches data as json
-        match_ids = get_match_ids(puuid)
-        save_match_data(match_ids, puuid, csv_file)
+    while True:
+        watch_once(puuids, in_game, pending, csv_file, stats)
+        time.sleep(WATCH_INTERVAL)
 
+def lookup(game_name, tag_line):
+    """A player's ranked stats right now, ahead of any running collection"""
+    puuid = get_puuid(game_name, tag_line)
+    print(json.dumps(get_ranked_stats(puuid), indent=4))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python api/riot_api.py lookup <game name> <tag line>
+    # python api/riot_api.py watch
+    if len(sys.argv) == 4 and sys.argv[1] == "lookup":
+        lookup(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 2 and sys.argv[1] == "watch":
+        watch()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Local stand-in for the Riot API, to run the collector and watch mode offline.
+
+The rostered players (GAME_NAME_i / TAG_LINE_i from the .env) play together
+in an endless series of games: each lasts --game-seconds, the next starts
+--gap-seconds later, and its match-v5 record only appears --match-delay
+seconds after the game ends, as on the live API. Served with the routing
+value as the first path segment, as riot_api.py asks for with RIOT_API_BASE:
+
+    /<routing>/riot/account/v1/accounts/by-riot-id/<name>/<tag>
+    /<routing>/lol/spectator/v5/active-games/by-summoner/<puuid>   404 between games
+    /<routing>/lol/match/v5/matches/by-puuid/<puuid>/ids
+    /<routing>/lol/match/v5/matches/<match id>                     404 until the record exists
+    /<routing>/lol/league/v4/entries/by-puuid/<puuid>
+    /<routing>/lol/champion-mastery/v4/champion-masteries/by-puuid/<puuid>
+
+    python api/riot_stub.py --game-seconds 60 --gap-seconds 30 --match-delay 20
+    RIOT_API_BASE=http://127.0.0.1:8766 WATCH_INTERVAL=5 MATCH_RETRY=5 python api/riot_api.py watch
+"""
+
+import argparse
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_PORT = 8766
+PLATFORM_ID = os.getenv("PLATFORM_ROUTING", "sg2").upper()
+FIRST_GAME_ID = 1000
+GAME_DURATION = 1800  # reported in the match record, long enough to be kept
+CHAMPIONS = [("Aatrox", 266), ("Ahri", 103), ("Jinx", 222), ("LeeSin", 64), ("Thresh", 412),
+             ("Darius", 122), ("Zed", 238), ("Vi", 254), ("Caitlyn", 51), ("Nami", 267)]
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+def puuid_for(game_name, tag_line):
+    return f"stub-{game_name}-{tag_line}"
+
+class RiotStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, players, port=DEFAULT_PORT, game_seconds=60, gap_seconds=30, match_delay=20):
+        super().__init__(("127.0.0.1", port), RiotStubHandler)
+        self.puuids = [puuid_for(name, tag) for name, tag in players]
+        self.game_seconds = game_seconds
+        self.gap_seconds = gap_seconds
+        self.match_delay = match_delay
+        self.started = time.time()
+
+    def current_game(self, now):
+        """(game number, its start time) of the game being played, or None between games"""
+        cycle = self.game_seconds + self.gap_seconds
+        number, into = divmod(now - self.started, cycle)
+        if into >= self.game_seconds:
+            return None
+        return int(number), self.started + number * cycle
+
+    def finished_games(self, now):
+        """Game numbers whose match record is available"""
+        cycle = self.game_seconds + self.gap_seconds
+        ready = now - self.started - self.game_seconds - self.match_delay
+        return range(int(ready // cycle) + 1) if ready >= 0 else range(0)
+
+    def match_id(self, number):
+        return f"{PLATFORM_ID}_{FIRST_GAME_ID + number}"
+
+    def match(self, number):
+        start = self.started + number * (self.game_seconds + self.gap_seconds)
+        fillers = [f"stub-filler-{i}" for i in range(10 - len(self.puuids))]
+        participants = []
+        for i, puuid in enumerate(self.puuids + fillers):
+            team = 100 if i < 5 else 200
+            champion_name, champion_id = CHAMPIONS[(i + number) % len(CHAMPIONS)]
+            participants.append({
+                "puuid": puuid, "teamId": team,
+                "championName": champion_name, "championId": champion_id,
+                "teamPosition": POSITIONS[i % 5],
+                "win": (team == 100) == (number % 2 == 0),
+                "kills": (i + number) % 9, "deaths": (i * 3 + number) % 7, "assists": (i * 5 + number) % 11,
+            })
+        return {
+            "metadata": {"matchId": self.match_id(number), "participants": [p["puuid"] for p in participants]},
+            "info": {
+                "gameId": FIRST_GAME_ID + number, "gameStartTimestamp": int(start * 1000),
+                "gameDuration": GAME_DURATION, "gameMode": "CLASSIC", "gameType": "MATCHED_GAME",
+                "gameVersion": "15.19.712.2468", "participants": participants,
+                "teams": [{"teamId": 100, "win": number % 2 == 0}, {"teamId": 200, "win": number % 2 == 1}],
+            },
+        }
+
+class RiotStubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        now = time.time()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p][1:]  # drop the routing value
+
+        if parts[:5] == ["riot", "account", "v1", "accounts", "by-riot-id"] and len(parts) == 7:
+            return self.reply({"puuid": puuid_for(parts[5], parts[6]), "gameName": parts[5], "tagLine": parts[6]})
+
+        if parts[:5] == ["lol", "spectator", "v5", "active-games", "by-summoner"] and len(parts) == 6:
+            game = server.current_game(now)
+            if game is None or parts[5] not in server.puuids:
+                return self.reply({"status": {"message": "Data not found", "status_code": 404}}, 404)
+            number, start = game
+            return self.reply({
+                "gameId": FIRST_GAME_ID + number, "platformId": PLATFORM_ID,
+                "gameStartTime": int(start * 1000), "gameLength": int(now - start),
+                "participants": [{"puuid": puuid} for puuid in server.puuids],
+            })
+
+        if parts[:4] == ["lol", "match", "v5", "matches"]:
+            if len(parts) == 7 and parts[4] == "by-puuid" and parts[6] == "ids":
+                # Newest first, like the live endpoint
+                ids = [server.match_id(n) for n in reversed(server.finished_games(now))]
+                start, count = int(query.get("start", [0])[0]), int(query.get("count", [20])[0])
+                return self.reply(ids[start:start + count])
+            if len(parts) == 5:
+                ready = {server.match_id(n): n for n in server.finished_games(now)}
+                if parts[4] not in ready:
+                    return self.reply({"status": {"message": "Data not found - match file not found",
+                                                  "status_code": 404}}, 404)
+                return self.reply(server.match(ready[parts[4]]))
+
+        if parts[:4] == ["lol", "league", "v4", "entries"] or parts[:3] == ["lol", "champion-mastery", "v4"]:
+            return self.reply([])
+
+        self.reply({"status": {"message": "Not found", "status_code": 404}}, 404)
+
+    def reply(self, data, status=200):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the Riot API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--game-seconds", type=float, default=60)
+    parser.add_argument("--gap-seconds", type=float, default=30)
+    parser.add_argument("--match-delay", type=float, default=20, help="seconds until a finished game's record exists")
+    args = parser.parse_args()
+
+    players = [(os.getenv(f"GAME_NAME_{i}"), os.getenv(f"TAG_LINE_{i}")) for i in range(1, 6)]
+    players = [(name, tag) for name, tag in players if name and tag]
+    server = RiotStub(players, args.port, args.game_seconds, args.gap_seconds, args.match_delay)
+    print(f"🧪 Riot API stand-in on http://127.0.0.1:{args.port} for {len(players)} players "
+          f"(RIOT_API_BASE=http://127.0.0.1:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,151 @@
+"""
+Shared Riot API rate budget with priority lanes.
+
+Every request to a Riot host draws from one budget per host (the app rate
+limits: 20 requests per second and 100 per 2 minutes). The budget lives in
+a small sqlite file, so every process using it shares the same limits: a
+lookup run from another terminal and the collector's backfill never
+overrun the key together. Waiting requests are served by lane:
+
+    interactive   one-off lookups (a player's ranked stats before a scrim)
+    incremental   refreshing the rostered players (accounts, ranks, new match ids)
+    backfill      fetching match history
+
+A request only starts while no higher lane is waiting on the same host, and
+lower lanes may only fill part of each window. That keeps headroom for an
+urgent lookup, which then waits for the one-second window at most even in
+the middle of a multi-hour backfill; backfill uses all the rest.
+
+    scheduler = RequestScheduler()
+    r = scheduler.get(url, {"api_key": key}, lane=INTERACTIVE)
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+# Retry-After parsing is shared with the scrapers
+sys.path.append(str(Path(__file__).resolve().parent.parent / "scraper"))
+from politeness import parse_retry_after
+
+INTERACTIVE, INCREMENTAL, BACKFILL = "interactive", "incremental", "backfill"
+LANES = (INTERACTIVE, INCREMENTAL, BACKFILL)
+
+# Part of each window a lane may fill; the rest is kept for the lanes above it
+SHARES = {INTERACTIVE: 1.0, INCREMENTAL: 0.95, BACKFILL: 0.9}
+
+# (requests, seconds) per host
+LIMITS = [(20, 1), (100, 120)]
+
+BUDGET_FILE = os.getenv("RIOT_BUDGET_DB", "riot_budget.sqlite")
+REQUEST_TIMEOUT = 30
+
+# Transient failures are retried with exponential backoff (2s, 4s, 8s)
+SERVER_ERRORS = (500, 502, 503, 504)
+SERVER_RETRIES = 3
+MIN_WAIT = 0.05
+MAX_WAIT = 1.0  # waiters check in at least this often
+WAITER_TTL = 5.0  # waiters not seen for this long are gone (process killed)
+
+class RequestScheduler:
+    def __init__(self, path=BUDGET_FILE, limits=LIMITS):
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS sent (host TEXT, at REAL);
+            CREATE INDEX IF NOT EXISTS sent_host_at ON sent (host, at);
+            CREATE TABLE IF NOT EXISTS waiting (id INTEGER PRIMARY KEY, host TEXT, lane INTEGER, seen REAL);
+            CREATE TABLE IF NOT EXISTS paused (host TEXT PRIMARY KEY, until REAL);
+        """)
+
+    def _try_start(self, host, lane, waiter):
+        """Record a request if the lane may send one now; else return how long to wait"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute("DELETE FROM sent WHERE at < ?", (now - max(w for _, w in self.limits),))
+                self.db.execute("DELETE FROM waiting WHERE seen < ?", (now - WAITER_TTL,))
+                self.db.execute("UPDATE waiting SET seen = ? WHERE id = ?", (now, waiter))
+
+                paused = self.db.execute("SELECT until FROM paused WHERE host = ?", (host,)).fetchone()
+                if paused and paused[0] > now:
+                    return paused[0] - now
+
+                ahead = self.db.execute(
+                    "SELECT COUNT(*) FROM waiting WHERE host = ? AND lane < ?", (host, lane)
+                ).fetchone()[0]
+                if ahead:
+                    return MIN_WAIT
+
+                for limit, window in self.limits:
+                    allowed = max(1, int(limit * SHARES[LANES[lane]]))
+                    count, oldest = self.db.execute(
+                        "SELECT COUNT(*), MIN(at) FROM sent WHERE host = ? AND at > ?", (host, now - window)
+                    ).fetchone()
+                    if count >= allowed:
+                        return max(oldest + window - now, MIN_WAIT)
+
+                self.db.execute("INSERT INTO sent VALUES (?, ?)", (host, now))
+                self.db.execute("DELETE FROM waiting WHERE id = ?", (waiter,))
+                return 0
+            finally:
+                self.db.execute("COMMIT")
+
+    def acquire(self, host, lane=INTERACTIVE):
+        """Block until a request to host may start in this lane"""
+        rank = LANES.index(lane)
+        with self.lock:
+            waiter = self.db.execute(
+                "INSERT INTO waiting (host, lane, seen) VALUES (?, ?, ?)", (host, rank, time.time())
+            ).lastrowid
+        try:
+            while True:
+                wait = self._try_start(host, rank, waiter)
+                if not wait:
+                    return
+                time.sleep(min(wait, MAX_WAIT))
+        finally:
+            with self.lock:
+                self.db.execute("DELETE FROM waiting WHERE id = ?", (waiter,))
+
+    def pause(self, host, seconds):
+        """Hold every lane on a host, e.g. for a 429's Retry-After"""
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO paused VALUES (?, ?)", (host, time.time() + seconds))
+
+    def get(self, url, params=None, lane=INTERACTIVE):
+        """GET through the budget, waiting out 429s and retrying server errors; returns the response"""
+        host = urlparse(url).hostname
+        failures = 0
+        while True:
+            self.acquire(host, lane)
+            try:
+                r = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if failures >= SERVER_RETRIES:
+                    raise
+                error = type(e).__name__
+            else:
+                if r.status_code == 429:
+                    retry = parse_retry_after(r.headers.get("Retry-After"))
+                    if retry is None:
+                        retry = 120
+                    print(f"Rate limit hit on {host}, retrying in {retry:.0f}s...")
+                    self.pause(host, retry)
+                    continue
+                if r.status_code not in SERVER_ERRORS or failures >= SERVER_RETRIES:
+                    return r
+                error = r.status_code
+            failures += 1
+            wait = 2 ** failures
+            print(f"{error} from {host}, retry {failures}/{SERVER_RETRIES} in {wait}s...")
+            time.sleep(wait)
@@ -0,0 +1,185 @@
+"""
+Run the Riot API collector and the scrapers as one dependency graph.
+
+Every entry point, and the post-processing built on their outputs, is a job
+with the jobs it depends on and the resource pool it draws from. Jobs start
+as soon as their dependencies have succeeded and their pool has room, so
+Riot API ingestion runs alongside browser scraping and the whole refresh
+takes about as long as its slowest chain instead of the sum of all stages.
+
+    python pipeline.py                      # everything
+    python pipeline.py --only lolalytics_counters lolalytics_synergy
+    python pipeline.py --browser-jobs 1 --dry-run
+
+Each job's output goes to logs/<job>.log; a timing table is printed at the
+end. Pool limits: RIOT_JOBS, BROWSER_JOBS, HTTP_JOBS (or the flags below).
+
+The scrapers run from one sweep plan (logs/sweep_plan.json, or SWEEP_PLAN if
+set), so the lolalytics counters job captures the synergy view of every
+build page it loads and the synergy job reads it from the snapshot store.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# The sweep planner lives with the scrapers
+sys.path.append(str(ROOT / "scraper"))
+from sweep import SOURCES, plan, plan_id
+
+Job = namedtuple("Job", ["name", "script", "deps", "pool"])
+
+Result = namedtuple("Result", ["status", "started", "finished"])
+
+JOBS = [
+    Job("riot", "api/riot_api.py", [], "riot"),
+    Job("ugg", "scraper/scraper.py", [], "browser"),
+    Job("lolalytics_counters", "scraper/scraplolalytics.py", [], "browser"),
+    # Reads the build pages the counters job captured as snapshots (shared sweep plan)
+    Job("lolalytics_synergy", "scraper/lolanalytics-synergy.py", ["lolalytics_counters"], "browser"),
+    Job("lolalytics_tierlist", "scraper/lolalytics-winrate.py", [], "browser"),
+    Job("leagueofgraphs", "scraper/scraperwinrate-rankgame.py", [], "http"),
+    Job("matrix", "scraper/matrix.py", ["lolalytics_counters", "lolalytics_synergy"], "local"),
+]
+
+# Concurrent jobs per pool: one Riot key, a few Chrome processes, one polite
+# HTTP crawler, local post-processing
+LIMITS = {
+    "riot": int(os.getenv("RIOT_JOBS", 1)),
+    "browser": int(os.getenv("BROWSER_JOBS", 2)),
+    "http": int(os.getenv("HTTP_JOBS", 1)),
+    "local": 2,
+}
+
+POLL_INTERVAL = 0.5
+
+def select(jobs, only=None, skip=None):
+    """Jobs to run; dependencies outside the selection count as satisfied"""
+    names = {job.name for job in jobs}
+    for name in (only or []) + (skip or []):
+        if name not in names:
+            raise SystemExit(f"Unknown job: {name} (choose from {', '.join(sorted(names))})")
+    selected = [job for job in jobs if (not only or job.name in only) and job.name not in (skip or [])]
+    chosen = {job.name for job in selected}
+    return [job._replace(deps=[d for d in job.deps if d in chosen]) for job in selected]
+
+def run(jobs, limits, log_dir, env):
+    """Run the graph; returns {name: Result}"""
+    log_dir.mkdir(exist_ok=True)
+    pending = {job.name: job for job in jobs}
+    running = {}  # name -> (process, log file, started)
+    results = {}
+    busy = {pool: 0 for pool in limits}
+    t0 = time.monotonic()
+
+    while pending or running:
+        for name, job in list(pending.items()):
+            if any(results.get(dep, Result(None, 0, 0)).status not in (None, "ok") for dep in job.deps):
+                # A dependency failed, so this job would only work from stale inputs
+                del pending[name]
+                now = time.monotonic() - t0
+                results[name] = Result("skipped", now, now)
+                print(f"⏭ {name}: skipped (dependency failed)")
+                continue
+            if any(results.get(dep, Result(None, 0, 0)).status != "ok" for dep in job.deps):
+                continue
+            if busy[job.pool] >= limits[job.pool]:
+                continue
+
+            log = open(log_dir / f"{name}.log", "w", encoding="utf-8")
+            process = subprocess.Popen(
+                [sys.executable, str(ROOT / job.script)],
+                stdout=log, stderr=subprocess.STDOUT, env=env,
+            )
+            busy[job.pool] += 1
+            running[name] = (process, log, time.monotonic() - t0)
+            del pending[name]
+            print(f"🚀 {name} started ({job.pool} {busy[job.pool]}/{limits[job.pool]})")
+
+        for name, (process, log, started) in list(running.items()):
+            if process.poll() is None:
+                continue
+            log.close()
+            del running[name]
+            busy[next(job.pool for job in jobs if job.name == name)] -= 1
+            finished = time.monotonic() - t0
+            status = "ok" if process.returncode == 0 else f"exit {process.returncode}"
+            results[name] = Result(status, started, finished)
+            icon = "✅" if status == "ok" else "❌"
+            print(f"{icon} {name}: {status} in {finished - started:.1f}s (log: {log_dir / f'{name}.log'})")
+
+        time.sleep(POLL_INTERVAL)
+
+    return results
+
+def write_plan(jobs, plan_file):
+    """One sweep plan for every selected scraper, so pages they share are loaded once"""
+    items = plan([job.name for job in jobs if job.name in SOURCES])
+    plan_file.write_text(json.dumps({
+        "id": plan_id(items),
+        "items": [item._asdict() for item in items],
+    }, indent=1))
+    return items
+
+def report(jobs, results, wall):
+    """Per-stage timing table"""
+    print("\n" + "=" * 60)
+    print(f"{'job':<22}{'status':<10}{'start':>8}{'end':>8}{'time':>9}")
+    print("=" * 60)
+    for job in sorted(jobs, key=lambda j: results[j.name].started):
+        r = results[job.name]
+        print(f"{job.name:<22}{r.status:<10}{r.started:>7.1f}s{r.finished:>7.1f}s{r.finished - r.started:>8.1f}s")
+    total = sum(r.finished - r.started for r in results.values())
+    print("=" * 60)
+    print(f"⏱ Wall time {wall:.1f}s for {total:.1f}s of stages")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Riot ingestion and the scrapers as a job graph")
+    parser.add_argument("--only", nargs="+", help="run just these jobs")
+    parser.add_argument("--skip", nargs="+", help="leave these jobs out")
+    parser.add_argument("--riot-jobs", type=int, default=LIMITS["riot"])
+    parser.add_argument("--browser-jobs", type=int, default=LIMITS["browser"])
+    parser.add_argument("--http-jobs", type=int, default=LIMITS["http"])
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--dry-run", action="store_true", help="only print the graph")
+    args = parser.parse_args()
+
+    jobs = select(JOBS, args.only, args.skip)
+    limits = {**LIMITS, "riot": args.riot_jobs, "browser": args.browser_jobs, "http": args.http_jobs}
+    for pool in {job.pool for job in jobs}:
+        if limits[pool] < 1:
+            raise SystemExit(f"The {pool} pool needs room for at least one job")
+
+    for job in jobs:
+        deps = f" after {', '.join(job.deps)}" if job.deps else ""
+        print(f"🧩 {job.name} [{job.pool}] {job.script}{deps}")
+    if args.dry_run:
+        return
+
+    # Jobs share pages through the snapshot store, planned as one sweep
+    env = {**os.environ}
+    env.setdefault("SNAPSHOT_DIR", "snapshots")
+    if "SWEEP_PLAN" not in env:
+        log_dir = Path(args.log_dir)
+        log_dir.mkdir(exist_ok=True)
+        plan_file = log_dir / "sweep_plan.json"
+        items = write_plan(jobs, plan_file)
+        env["SWEEP_PLAN"] = str(plan_file.resolve())
+        print(f"🗺 Planned {len(items)} work items for the scrapers -> {plan_file}")
+
+    t0 = time.monotonic()
+    results = run(jobs, limits, Path(args.log_dir), env)
+    report(jobs, results, time.monotonic() - t0)
+
+    if any(r.status != "ok" for r in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
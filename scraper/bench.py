@@ -0,0 +1,175 @@
+"""
+Throughput benchmark of the scrapers against the local fixture sites.
+
+Starts the fixture server (fixtures.py), plans a small sweep for each
+scraper pointed at it (SITE_OVERRIDE) and runs the scraper in a scratch
+directory, one at a time. For each one it reports:
+
+- pages/sec: pages the fixture server served, over the scraper's wall time,
+- CPU seconds: user + sys of the scraper and the processes it started
+  (chromedriver, Chrome),
+- peak RSS: the largest total resident memory of that process tree.
+
+    python scraper/bench.py                                   # every scraper, 10 champions
+    python scraper/bench.py --sources leagueofgraphs ugg --champions 20 --latency 0.1
+    python scraper/bench.py --out baseline.json               # keep the numbers to compare later
+
+Memory is sampled from /proc, so this runs on Linux. Snapshots are turned
+off so every page is loaded; a warm browser (BROWSER_ADDRESS) is left to
+the caller and its memory is not counted.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from champions import CHAMPIONS
+from fixtures import FixtureServer
+from sweep import SOURCES, plan, plan_id
+
+Result = namedtuple("Result", ["source", "status", "pages", "seconds", "cpu_seconds", "peak_rss_mb"])
+
+HERE = Path(__file__).resolve().parent
+SAMPLE_INTERVAL = 0.1
+
+def process_tree(root):
+    """pid of a process and all its descendants"""
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            # Fields after the command name: state, ppid, ...
+            ppid = int(stat.read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(stat.parent.name))
+    tree, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack += children.get(pid, [])
+    return tree
+
+def rss_kb(pid):
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+class PeakMemory:
+    """Samples the total RSS of a process tree from a background thread"""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.peak_kb = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+
+    def _sample(self):
+        while not self.stopped.is_set():
+            total = sum(rss_kb(pid) for pid in process_tree(self.pid))
+            self.peak_kb = max(self.peak_kb, total)
+            self.stopped.wait(SAMPLE_INTERVAL)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        return self.peak_kb
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def run_source(source, items, server, workdir, env):
+    """Run one scraper over its planned items; returns a Result"""
+    run_dir = workdir / source
+    run_dir.mkdir(parents=True, exist_ok=True)
+    plan_file = run_dir / "sweep_plan.json"
+    plan_file.write_text(json.dumps({"id": plan_id(items), "items": [i._asdict() for i in items]}))
+
+    env = {**env, "SWEEP_PLAN": str(plan_file)}
+    hits = sum(server.hits.values())
+    cpu = cpu_seconds()
+    t0 = time.monotonic()
+    with open(run_dir / "run.log", "w", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(HERE / SOURCES[source].script)],
+            stdout=log, stderr=subprocess.STDOUT, env=env, cwd=run_dir,
+        )
+        memory = PeakMemory(process.pid)
+        process.wait()
+        peak_kb = memory.stop()
+
+    seconds = time.monotonic() - t0
+    status = "ok" if process.returncode == 0 else f"exit {process.returncode}"
+    return Result(source, status, sum(server.hits.values()) - hits, seconds,
+                  cpu_seconds() - cpu, peak_kb / 1024)
+
+def report(results):
+    """Throughput table"""
+    print("\n" + "=" * 78)
+    print(f"{'scraper':<22}{'status':<9}{'pages':>7}{'time':>9}{'pages/s':>10}{'CPU s':>9}{'peak RSS':>12}")
+    print("=" * 78)
+    for r in results:
+        rate = r.pages / r.seconds if r.seconds else 0
+        print(f"{r.source:<22}{r.status:<9}{r.pages:>7}{r.seconds:>8.1f}s{rate:>10.2f}"
+              f"{r.cpu_seconds:>9.1f}{r.peak_rss_mb:>9.0f} MB")
+    print("=" * 78)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against the local fixture sites")
+    parser.add_argument("--sources", nargs="+", default=list(SOURCES), choices=list(SOURCES))
+    parser.add_argument("--champions", type=int, default=10, help="first N champions of the list")
+    parser.add_argument("--patch", default="15.19")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--render-ms", type=int, default=20)
+    parser.add_argument("--host-cap", type=int, default=4, help="pages in flight the politeness controller may reach")
+    parser.add_argument("--workdir", help="keep outputs and logs here instead of a temporary directory")
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    server = FixtureServer(0, args.latency, args.jitter, args.render_ms).start()
+    print(f"🧪 Fixture sites on {server.url}")
+
+    # Every page goes to the fixture server, which all counts as one host
+    env = {**os.environ, "SITE_OVERRIDE": server.url, "PATCH": args.patch,
+           "HOST_CAPS": f"127.0.0.1={args.host_cap}"}
+    env.pop("SNAPSHOT_DIR", None)
+    os.environ["SITE_OVERRIDE"] = server.url
+
+    champions = CHAMPIONS[:args.champions]
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        workdir = Path(args.workdir or scratch).resolve()
+        for source in [name for name in SOURCES if name in args.sources]:
+            items = plan([source], champions=champions, patches=[args.patch])
+            print(f"🚀 {source}: {len(items)} items")
+            result = run_source(source, items, server, workdir, env)
+            icon = "✅" if result.status == "ok" else "❌"
+            print(f"{icon} {source}: {result.status}, {result.pages} pages in {result.seconds:.1f}s")
+            results.append(result)
+
+    server.shutdown()
+    report(results)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({
+            "settings": {k: v for k, v in vars(args).items() if k not in ("workdir", "out")},
+            "results": [r._asdict() for r in results],
+        }, indent=1))
+        print(f"💾 Results written to {args.out}")
+
+if __name__ == "__main__":
+    main()
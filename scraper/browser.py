@@ -0,0 +1,272 @@
+"""
+Shared lean Chrome profile for the Selenium scrapers.
+
+The scrapers only read text and attributes out of the DOM, so everything the
+page pulls in for display (champion images, fonts, video, ads, analytics) is
+blocked before it is downloaded.
+
+TabPool drives many tabs of one browser instead of one browser per worker,
+for machines where several Chrome processes do not fit in memory.
+
+Browsers are only started when a scraper asks for one (make_driver or the
+browser_session context manager), never at import. To skip Chrome's cold
+start, keep a warm browser running between runs and attach to it:
+
+    python scraper/browser.py serve            # in another terminal
+    BROWSER_ADDRESS=127.0.0.1:9222 python scraper/scraplolalytics.py
+
+Attached scrapers work in their own tabs and close them when done; the
+browser, its profile and its HTTP cache stay up for the next run.
+
+Chrome runs headless; HEADED=1 shows the window, e.g. to watch a scraper.
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+
+from politeness import controller_for
+from profiling import profiler
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Resource types are blocked by URL pattern through the DevTools protocol.
+# Image URLs are still present in the DOM (src/alt), they just never load.
+BLOCKED_URL_PATTERNS = [
+    # images
+    "*.webp", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.avif",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # media
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8",
+]
+
+# Third-party hosts (ads, analytics, consent and video players)
+BLOCKED_HOSTS = [
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "googletagservices.com", "adservice.google.com",
+    "amazon-adsystem.com", "adnxs.com", "pubmatic.com", "rubiconproject.com",
+    "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "quantserve.com",
+    "scorecardresearch.com", "hotjar.com", "facebook.net", "connect.facebook.net",
+    "nitropay.com", "playwire.com", "fundingchoicesmessages.google.com",
+    "cookielaw.org", "onetrust.com", "youtube.com", "twitch.tv", "jwplayer.com",
+]
+
+CHROME_FLAGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+    "profile.managed_default_content_settings.geolocation": 2,
+    "profile.default_content_setting_values.autoplay": 2,
+}
+
+# HEADED=1 opens a visible window instead of running headless
+HEADLESS = not os.getenv("HEADED")
+
+def make_options(headless=HEADLESS, page_load_strategy="normal"):
+    """Build Chrome options for the lean scraping profile"""
+    options = Options()
+    options.page_load_strategy = page_load_strategy
+    if headless:
+        options.add_argument("--headless")
+    for flag in CHROME_FLAGS:
+        options.add_argument(flag)
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    options.add_experimental_option("prefs", CHROME_PREFS)
+    return options
+
+def block_resources(driver):
+    """Block images, fonts, media and third-party hosts via network interception"""
+    patterns = BLOCKED_URL_PATTERNS + [f"*{host}*" for host in BLOCKED_HOSTS]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+# SCRAPER_TABS=4 makes the scrapers load pages as that many tabs of a single
+# browser (TabPool) instead of one page at a time. The host's politeness cap
+# (HOST_CAPS, e.g. 4 for u.gg and lolalytics.com) still bounds how many load
+# at once, so more tabs than the cap only help with a raised HOST_CAPS.
+TABS = int(os.getenv("SCRAPER_TABS", 0))
+
+# host:port of a warm browser started with `browser.py serve`
+BROWSER_ADDRESS = os.getenv("BROWSER_ADDRESS")
+BROWSER_PORT = 9222
+BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "browser_profile")
+
+def make_driver(headless=HEADLESS, page_load_strategy="normal"):
+    """Start Chrome with the lean profile and resource blocking enabled"""
+    if BROWSER_ADDRESS:
+        return attach_driver(BROWSER_ADDRESS, page_load_strategy)
+    driver = webdriver.Chrome(options=make_options(headless, page_load_strategy))
+    block_resources(driver)
+    return profiler.instrument(driver)
+
+def attach_driver(address, page_load_strategy="normal"):
+    """Drive a running browser in a new tab of its own"""
+    # The running browser already has the lean flags; only attach options apply
+    options = Options()
+    options.page_load_strategy = page_load_strategy
+    options.add_experimental_option("debuggerAddress", address)
+    driver = webdriver.Chrome(options=options)
+    driver.attached_to = set(driver.window_handles)
+    driver.switch_to.new_window("tab")
+    block_resources(driver)
+    return profiler.instrument(driver)
+
+def quit_driver(driver):
+    """Quit a browser we started, or close our tabs in one we attached to"""
+    preexisting = getattr(driver, "attached_to", None)
+    if preexisting is not None:
+        for handle in driver.window_handles:
+            if handle not in preexisting:
+                driver.switch_to.window(handle)
+                driver.close()
+    driver.quit()
+
+@contextmanager
+def browser_session(headless=HEADLESS, page_load_strategy="normal", enabled=True):
+    """Browser for the duration of a with block (None when not enabled, e.g. --reparse)"""
+    driver = make_driver(headless, page_load_strategy) if enabled else None
+    try:
+        yield driver
+    finally:
+        if driver:
+            quit_driver(driver)
+
+def serve(port=BROWSER_PORT, headless=HEADLESS):
+    """Keep a warm lean browser running for scrapers to attach to"""
+    options = make_options(headless)
+    options.add_argument(f"--remote-debugging-port={port}")
+    options.add_argument(f"--user-data-dir={os.path.abspath(BROWSER_PROFILE)}")
+    driver = webdriver.Chrome(options=options)
+    block_resources(driver)
+    print(f"🔥 Warm browser listening on 127.0.0.1:{port} (profile: {BROWSER_PROFILE})")
+    print(f"   export BROWSER_ADDRESS=127.0.0.1:{port}   # Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        driver.quit()
+
+# Marker set on the old document before a tab navigates away, so a ready
+# check can tell the new page from the one it replaces
+STALE_MARK_JS = "window.__staleTab = true; window.location.href = arguments[0];"
+NEW_PAGE_JS = "return !window.__staleTab && document.readyState !== 'loading';"
+
+POLL_INTERVAL = 0.2
+
+class TabPool:
+    """
+    Many tabs of one Chrome process, loading pages at the same time.
+
+    Navigations are started in every free tab without waiting for them, as
+    far as the host's politeness controller allows; the tabs are then polled
+    in turn and each page is extracted in its own tab as soon as it is ready. Works best with make_driver(page_load_strategy="none")
+    so no command blocks on another tab's load.
+    """
+
+    def __init__(self, driver, size):
+        self.driver = driver
+        self.free = [driver.current_window_handle]
+        while len(self.free) < size:
+            driver.switch_to.new_window("tab")
+            # Request blocking is set per tab
+            block_resources(driver)
+            self.free.append(driver.current_window_handle)
+
+    def map(self, jobs, ready, extract, timeout=30):
+        """
+        Load (key, url) jobs across the tabs and yield (key, result, error).
+        ready(driver) is polled in a tab until its page can be read, then
+        extract(driver, key) runs with that tab focused.
+        """
+        driver = self.driver
+        pending = deque(jobs)
+        active = {}  # tab handle -> (key, url, started, politeness token)
+        while pending or active:
+            while pending and self.free:
+                key, url = pending[0]
+                token = controller_for(url).try_acquire()
+                if token is None:
+                    break
+                pending.popleft()
+                handle = self.free.pop()
+                driver.switch_to.window(handle)
+                driver.execute_script(STALE_MARK_JS, url)
+                active[handle] = (key, url, time.monotonic(), token)
+
+            for handle, (key, url, started, token) in list(active.items()):
+                driver.switch_to.window(handle)
+                try:
+                    if not (driver.execute_script(NEW_PAGE_JS) and ready(driver)):
+                        if time.monotonic() - started < timeout:
+                            continue
+                        raise TimeoutException(f"{url} not ready after {timeout}s")
+                    result, error = extract(driver, key), None
+                except Exception as e:
+                    result, error = None, e
+                controller_for(url).release(token, "ok" if error is None else "error")
+                del active[handle]
+                self.free.append(handle)
+                yield key, result, error
+
+            if active or pending:
+                time.sleep(POLL_INTERVAL)
+
+# Ready check for pages that can be read once an element is in the DOM
+SELECTOR_PRESENT_JS = "return !!document.querySelector(arguments[0]);"
+
+def scrape_tabs(items, load_snapshot, selector, extract):
+    """
+    Scrape items (with a url) as tabs of one browser; yields (item, result, error).
+    load_snapshot(item) returns a stored result, or None to load the page;
+    a page is read with extract(page, item) once selector matches in it.
+    """
+    jobs = []
+    for item in items:
+        result = load_snapshot(item)
+        if result is not None:
+            yield item, result, None
+        else:
+            jobs.append((item, item.url))
+    if not jobs:
+        return
+
+    browser = make_driver(page_load_strategy="none")
+    try:
+        tabs = TabPool(browser, TABS)
+        ready = lambda page: page.execute_script(SELECTOR_PRESENT_JS, selector)
+        yield from tabs.map(jobs, ready, extract)
+    finally:
+        quit_driver(browser)
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "serve":
+        ports = [int(arg) for arg in sys.argv[2:] if arg.isdigit()]
+        serve(ports[0] if ports else BROWSER_PORT, headless=HEADLESS and "--headed" not in sys.argv)
+    else:
+        print(__doc__)
@@ -0,0 +1,291 @@
+"""
+Scraping of lolalytics champion build pages, shared by the counters and
+synergy scrapers.
+
+A build page shows one list of matchup cards at a time, picked with a
+filter button per view ("strong against", "weak against", "good synergy").
+Each scraper reads its own views and writes them with a type column naming
+the view. In a sweep the first one to load a page also captures the views
+the other needs into the snapshot store, so the page is loaded once. With
+SCRAPER_TABS the pages load concurrently as tabs of one browser (TabPool).
+
+    COUNTERS = BuildPageScraper("lolalytics_counters", ["strong_against", "weak_against"],
+                                "counter_type", "champions_counters.csv", MATCHUPS)
+    run(COUNTERS)
+"""
+
+from collections import namedtuple
+from urllib.parse import parse_qs, urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from browser import TABS, browser_session, scrape_tabs
+from checkpoint import CsvCheckpoint
+from parsers import parse_matchups
+from politeness import controller_for
+from profiling import profiler
+from refresh import RefreshLedger
+from schema import numbers
+from snapshots import REPARSE, store_from_env
+from sweep import item_cell, load_plan, schedule
+
+# source: sweep source name; views: the filter buttons it reads; type_field:
+# the column naming the view of each row; csv_file and dtypes: its output
+BuildPageScraper = namedtuple("BuildPageScraper", ["source", "views", "type_field", "csv_file", "dtypes"])
+
+# Optional page snapshots (SNAPSHOT_DIR); --reparse works from them without a browser
+store = store_from_env()
+
+# Chrome with the lean scraping profile, started by run()
+driver = None
+
+BUILD_URL = "https://lolalytics.com/lol/{champion}/build/?tier={tier}&patch={patch}"
+
+# Filter button for every view of the build page, including the ones other
+# scrapers in a sweep read from the same page
+VIEW_BUTTONS = {
+    'strong_against': 'strong_counter',
+    'weak_against': 'weak_counter',
+    'good_synergy': 'good_synergy',
+}
+
+def columns(scraper):
+    return ['champion', 'role', scraper.type_field, 'opponent', 'win_rate', 'delta_1', 'delta_2',
+            'pick_rate', 'games', 'tier', 'patch']
+
+def scrape_visible_matchups(scraper, page, champion, view, url):
+    """Scrape the currently visible matchups after clicking a filter button"""
+    # Wait for content to fully load after button click
+    profiler.sleep(2)
+
+    # One round trip for the whole page, then parse it locally
+    with profiler.phase("extract"):
+        page_source = page.page_source
+    if store:
+        with profiler.phase("write"):
+            store.save(url, page_source, view=view)
+
+    with profiler.phase("parse"):
+        matchups = parse_matchups(page_source, champion, scraper.type_field, view)
+    print(f"    🔍 Found {len(matchups)} matchups")
+    return matchups
+
+def load_snapshot_matchups(scraper, champion, url):
+    """Parse the stored pages for a champion, or None if any view is missing or stale"""
+    matchups = []
+    for view in scraper.views:
+        snapshot = store.load(url, view=view)
+        if snapshot is None:
+            return None
+        matchups.extend(parse_matchups(snapshot.html, champion, scraper.type_field, view))
+    return matchups
+
+def sort_matchups(scraper, matchups):
+    # Win rates are still page text: convert the column once to order by it
+    win_rates = numbers([m['win_rate'] for m in matchups]).fillna(float('inf')).tolist()
+    order = sorted(range(len(matchups)),
+                   key=lambda i: (matchups[i]['role'], matchups[i][scraper.type_field], win_rates[i]))
+    matchups[:] = [matchups[i] for i in order]
+
+def scrape_champion_matchups(scraper, item):
+    """Scrape this scraper's views of a champion's build page"""
+    champion, url = item.champion, item.url
+
+    print(f"\n{'='*60}")
+    print(f"🔍 Scraping {champion.upper()} ({item.tier}, {item.patch})...")
+
+    if store:
+        matchups = load_snapshot_matchups(scraper, champion, url)
+        if matchups is not None:
+            print(f"  💾 Using stored snapshot for {champion}")
+            return matchups
+
+    # The host's controller spaces out live page loads
+    controller = controller_for(url)
+    with profiler.phase("sleep", url):
+        token = controller.acquire()
+    matchups = []
+    try:
+        matchups = load_champion_matchups(scraper, item)
+        return matchups
+    finally:
+        controller.release(token, "ok" if matchups else "error")
+
+def button_selector(view):
+    return f"div[data-type='{VIEW_BUTTONS[view]}']"
+
+def load_champion_matchups(scraper, item):
+    """Load a build page and scrape this scraper's views of it"""
+    with profiler.phase("navigate", item.url):
+        driver.get(item.url)
+
+    try:
+        # Wait for page to load - wait for filter buttons to appear
+        with profiler.phase("wait"):
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, button_selector(scraper.views[0])))
+            )
+    except TimeoutException:
+        print(f"  ⏱ Timeout loading {item.champion}")
+        return []
+
+    return read_views(scraper, driver, item)
+
+def read_views(scraper, page, item):
+    """Click through the views of a loaded build page and scrape this scraper's ones"""
+    champion, url = item.champion, item.url
+    all_matchups = []
+    # Views other sources need from this page are only captured as snapshots
+    extra_views = [view for view in item.views if view not in scraper.views] if store else []
+
+    profiler.sleep(3)  # Let page fully render
+
+    for view in scraper.views + extra_views:
+        print(f"  📊 Clicking '{view}' button...")
+        try:
+            with profiler.phase("click"):
+                button = page.find_element(By.CSS_SELECTOR, button_selector(view))
+
+                # Click the button
+                page.execute_script("arguments[0].scrollIntoView(true);", button)
+            profiler.sleep(0.5)
+            with profiler.phase("click"):
+                page.execute_script("arguments[0].click();", button)
+
+            # Wait for button to become active (has bg-[#3a7e93])
+            with profiler.phase("wait"):
+                WebDriverWait(page, 5).until(
+                    lambda d: 'bg-[#3a7e93]' in button.get_attribute('class')
+                )
+            print("    ✓ Button activated")
+
+            # Scrape the matchups
+            matchups = scrape_visible_matchups(scraper, page, champion, view, url)
+            if view in scraper.views:
+                print(f"    ✅ Collected {len(matchups)} '{view}' matchups")
+                all_matchups.extend(matchups)
+
+        except Exception as e:
+            print(f"    ⚠ Could not get {VIEW_BUTTONS[view]}: {str(e)[:100]}")
+
+    return all_matchups
+
+def scrape_one_by_one(scraper, items):
+    """Scrape build pages in turn in the session's browser; yields (item, matchups, error)"""
+    for i, item in enumerate(items, 1):
+        print(f"\n{'#'*60}")
+        print(f"Progress: {i}/{len(items)}")
+        try:
+            yield item, scrape_champion_matchups(scraper, item), None
+        except Exception as e:
+            yield item, None, e
+
+def scrape_in_tabs(scraper, items):
+    """Scrape build pages as tabs of one browser; yields (item, matchups, error)"""
+    def load_stored(item):
+        matchups = load_snapshot_matchups(scraper, item.champion, item.url) if store else None
+        if matchups is not None:
+            print(f"  💾 Using stored snapshot for {item.champion}")
+        return matchups
+
+    def extract(page, item):
+        print(f"\n🔍 Scraping {item.champion.upper()} ({item.tier}, {item.patch}) in its tab...")
+        matchups = read_views(scraper, page, item)
+        if not matchups:
+            raise ValueError(f"no matchups on {item.url}")
+        return matchups
+
+    return scrape_tabs(items, load_stored, button_selector(scraper.views[0]), extract)
+
+def reparse(scraper, output):
+    """Rebuild the output from stored snapshots without a browser"""
+    output.reset()
+    prefix = BUILD_URL.split("{champion}")[0]
+    by_url = {}
+    for view in scraper.views:
+        for snapshot in store.matching(prefix, view=view):
+            by_url.setdefault(snapshot.url, []).append((view, snapshot))
+    for url in sorted(by_url):
+        champion = url[len(prefix):].split("/")[0]
+        query = parse_qs(urlparse(url).query)
+        matchups = []
+        for view, snapshot in by_url[url]:
+            matchups.extend(parse_matchups(snapshot.html, champion, scraper.type_field, view))
+        for m in matchups:
+            m['tier'], m['patch'] = query['tier'][0], query['patch'][0]
+        sort_matchups(scraper, matchups)
+        if matchups:
+            output.write(url, matchups)
+        print(f"  ♻ Re-parsed {len(matchups)} matchups for {champion}")
+
+def scrape(scraper):
+    """Scrape (or re-parse) every planned build page; returns the checkpointed output"""
+    # Matchups are written per build page so a crash only loses the current one
+    items, run_id = ([], None) if REPARSE else load_plan(scraper.source)
+    output = CsvCheckpoint(scraper.csv_file, columns(scraper), run_id=run_id, dtypes=scraper.dtypes)
+
+    if REPARSE:
+        reparse(scraper, output)
+        to_fetch = []
+    else:
+        # Pages fetched recently on their patch are reused from the ledger
+        ledger = RefreshLedger()
+        to_fetch, fresh = schedule(ledger, scraper.source, items)
+        for item, matchups in fresh:
+            if not output.is_done(item.url):
+                output.write(item.url, matchups)
+
+    # Scrape stale pages, most urgent first
+    to_fetch = [item for item in to_fetch if not output.is_done(item.url)]
+    results = scrape_in_tabs(scraper, to_fetch) if TABS else scrape_one_by_one(scraper, to_fetch)
+    for item, matchups, error in results:
+        if error:
+            print(f"  ❌ Failed to scrape {item.champion}: {error}")
+            continue
+
+        for m in matchups:
+            m['tier'], m['patch'] = item.tier, item.patch
+        sort_matchups(scraper, matchups)
+        if not matchups:
+            # Left out of the manifest so the next run tries the page again
+            print(f"  ❌ No matchups for {item.champion}, will retry next run")
+            continue
+        ledger.record(scraper.source, item_cell(item), item.patch, matchups)
+        with profiler.phase("write"):
+            output.write(item.url, matchups)
+        print(f"  📊 Matchups for {item.champion}: {len(matchups)}")
+
+    if not REPARSE:
+        output.complete()
+    return output
+
+def print_sample(output):
+    print("\n" + "="*60)
+    print("SAMPLE DATA:")
+    print("="*60)
+    for sample in output.read_chunks(chunksize=10):
+        print(sample.to_string(index=False))
+        break
+
+def run(scraper, finish=None):
+    """
+    Scrape with a browser (none for --reparse), then call finish(output)
+    with the complete output if anything was saved.
+    """
+    global driver
+    try:
+        # Tab mode starts its own browser
+        with browser_session(enabled=not (REPARSE or TABS)) as driver:
+            output = scrape(scraper)
+        if output.done:
+            print(f"\n✅ Saved {len(output.done)} champions' matchups to {scraper.csv_file}")
+            if finish:
+                finish(output)
+            print_sample(output)
+        else:
+            print("\n❌ No data collected!")
+    finally:
+        print("\n🏁 Scraping completed!")
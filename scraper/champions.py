@@ -0,0 +1,9 @@
+"""
+Champion slugs shared by the scrapers (lowercase, no spaces or punctuation),
+in display name order. They come from the champion registry (registry.py),
+which also maps them to the integer codes the outputs store.
+"""
+
+from registry import registry
+
+CHAMPIONS = [registry().slug(code) for code in registry().codes]
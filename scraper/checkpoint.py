@@ -0,0 +1,117 @@
+"""
+Crash-safe incremental CSV output with a progress manifest.
+
+Rows are appended to the CSV as soon as a unit of work (a champion, a
+champion x role, a lane) is finished, then the unit is recorded in a
+manifest next to the CSV together with the CSV size at that point. A
+restarted run skips every unit in the manifest and truncates any rows that
+were written after the last recorded unit, so nothing is duplicated. Once a
+sweep is marked complete (or the run id, e.g. the patch, changes) the next
+run starts a fresh file. With a schema (schema.py) each unit's rows are
+converted to its dtypes column by column before they are written, and read
+back with them.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from schema import table
+
+class CsvCheckpoint:
+    def __init__(self, csv_file, columns, run_id=None, dtypes=None):
+        self.csv_file = Path(csv_file)
+        self.manifest_file = self.csv_file.with_name(self.csv_file.name + ".progress")
+        self.columns = columns
+        self.dtypes = dtypes
+        self.run_id = None if run_id is None else str(run_id)
+        self.done = set()
+        self._load()
+
+    def _load(self):
+        """Read the manifest and drop rows from a unit that never completed"""
+        offset = 0
+        run_id = None
+        complete = False
+        if self.manifest_file.exists():
+            with open(self.manifest_file, encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if not line:
+                        continue
+                    key, _, value = line.rpartition("\t")
+                    if key == "#run":
+                        run_id = value
+                    elif key == "#complete":
+                        complete = True
+                    else:
+                        self.done.add(key)
+                        offset = int(value)
+
+        # A finished sweep or one for a different run (e.g. an older patch)
+        # is not resumed; the next run starts a new file
+        if complete or (self.run_id is not None and run_id is not None and run_id != self.run_id):
+            self.reset()
+            return
+
+        if self.csv_file.exists() and self.csv_file.stat().st_size > offset:
+            if offset == 0:
+                self.csv_file.unlink()
+            else:
+                with open(self.csv_file, "r+b") as f:
+                    f.truncate(offset)
+
+        if self.done:
+            print(f"↻ Resuming {self.csv_file}: {len(self.done)} units already done")
+
+    @staticmethod
+    def _key(key):
+        return "|".join(str(k) for k in key) if isinstance(key, tuple) else str(key)
+
+    def is_done(self, key):
+        return self._key(key) in self.done
+
+    def _append_manifest(self, line):
+        with open(self.manifest_file, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def write(self, key, rows):
+        """
+        Append the rows of a finished unit and mark it done. Units that failed
+        are left out, so a resumed run tries them again.
+        """
+        if self.run_id is not None and not self.manifest_file.exists():
+            self._append_manifest(f"#run\t{self.run_id}")
+
+        if rows:
+            df = table(rows, self.columns, self.dtypes) if self.dtypes else pd.DataFrame(rows, columns=self.columns)
+            with open(self.csv_file, "a", encoding="utf-8", newline="") as f:
+                df.to_csv(f, index=False, header=f.tell() == 0)
+                f.flush()
+                os.fsync(f.fileno())
+
+        size = self.csv_file.stat().st_size if self.csv_file.exists() else 0
+        self._append_manifest(f"{self._key(key)}\t{size}")
+        self.done.add(self._key(key))
+
+    def complete(self):
+        """Mark the sweep finished so the next run starts over instead of resuming"""
+        self._append_manifest("#complete\t0")
+
+    def read_chunks(self, chunksize=10_000, **read_csv_args):
+        """Stream the written rows back without loading the whole file"""
+        if not self.csv_file.exists():
+            return iter(())
+        if self.dtypes:
+            read_csv_args.setdefault("dtype", self.dtypes)
+        return pd.read_csv(self.csv_file, chunksize=chunksize, **read_csv_args)
+
+    def reset(self):
+        """Forget all progress and start the output from scratch"""
+        for path in (self.csv_file, self.manifest_file):
+            if path.exists():
+                path.unlink()
+        self.done.clear()
@@ -0,0 +1,98 @@
+"""
+Dense numeric storage for the leagueofgraphs winrate curves.
+
+Curves are parsed once at scrape time into a float32 array indexed by
+champion x role x bucket (the graph's x axis, ranked games played) and saved
+as .npy files that can be memory-mapped, next to a boolean missing-data mask
+and a JSON index of the champion slugs and codes (registry.py), role and
+bucket labels.
+
+    values, missing, index = load_curves("winrate_rankgames")
+    values[index["codes"].index(registry().code("ahri")), index["roles"].index("middle")]
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from registry import registry
+
+BUCKETS = (0, 10, 20, 30, 40, 50)
+
+def parse_curve(data_str):
+    """Parse a graphDD13 data string into one value per bucket (NaN where absent)"""
+    curve = np.full(len(BUCKETS), np.nan, dtype=np.float32)
+    if not data_str:
+        return curve
+    for x, y in json.loads(data_str):
+        if x in BUCKETS:
+            curve[BUCKETS.index(x)] = y
+    return curve
+
+def _paths(prefix):
+    prefix = Path(prefix)
+    return (
+        prefix.with_name(prefix.name + "_curves.npy"),
+        prefix.with_name(prefix.name + "_missing.npy"),
+        prefix.with_name(prefix.name + "_index.json"),
+    )
+
+class CurveStore:
+    """Writable memory-mapped curve array, reopened in place on resume"""
+
+    def __init__(self, prefix, champions, roles):
+        self.values_file, self.missing_file, self.index_file = _paths(prefix)
+        # Positions follow the given champions; curves are looked up by code
+        codes = [registry().code(c) for c in champions]
+        self.champions = {code: i for i, code in enumerate(codes) if code is not None}
+        self.roles = {r: i for i, r in enumerate(roles)}
+        shape = (len(champions), len(roles), len(BUCKETS))
+        index = {"champions": list(champions), "codes": codes, "roles": list(roles), "buckets": list(BUCKETS)}
+
+        if self._matches(index):
+            self.values = np.load(self.values_file, mmap_mode="r+")
+            self.missing = np.load(self.missing_file, mmap_mode="r+")
+        else:
+            self.values = np.lib.format.open_memmap(self.values_file, mode="w+", dtype=np.float32, shape=shape)
+            self.values[:] = np.nan
+            self.missing = np.lib.format.open_memmap(self.missing_file, mode="w+", dtype=np.bool_, shape=shape)
+            self.missing[:] = True
+            self.index_file.write_text(json.dumps(index))
+
+    def _matches(self, index):
+        """Whether existing files were built for the same champions, roles and buckets"""
+        if not (self.values_file.exists() and self.missing_file.exists() and self.index_file.exists()):
+            return False
+        existing = json.loads(self.index_file.read_text())
+        if "codes" not in existing:
+            # Written before champion codes: same positions, only the codes are new
+            existing["codes"] = index["codes"]
+            if existing == index:
+                self.index_file.write_text(json.dumps(index))
+        return existing == index
+
+    def reset(self):
+        self.values[:] = np.nan
+        self.missing[:] = True
+
+    def set(self, champion, role, data_str):
+        """Store one scraped curve (champion by any spelling or code); data_str of None marks it missing"""
+        code = registry().code(champion)
+        if code not in self.champions or role not in self.roles:
+            return
+        curve = parse_curve(data_str)
+        i, j = self.champions[code], self.roles[role]
+        self.values[i, j] = curve
+        self.missing[i, j] = np.isnan(curve)
+
+    def flush(self):
+        self.values.flush()
+        self.missing.flush()
+
+def load_curves(prefix, mmap_mode="r"):
+    """Load every curve in one go: (values, missing mask, index)"""
+    values_file, missing_file, index_file = _paths(prefix)
+    values = np.load(values_file, mmap_mode=mmap_mode)
+    missing = np.load(missing_file, mmap_mode=mmap_mode)
+    return values, missing, json.loads(index_file.read_text())
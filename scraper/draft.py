@@ -0,0 +1,167 @@
+"""
+Champion select pick recommender over the scraped matchup data.
+
+Scores every champion still available for a role in one vectorised pass:
+
+- counters: lolalytics win rate delta of the candidate against each enemy
+  pick (from the enemy's page, mirrored, where the candidate's is missing),
+- synergy: delta with each ally pick,
+- role strength: tier list win rate in the role (lolalytics_champions_all.csv),
+  candidates without a tier list entry for the role are left out,
+- mastery: the player's champion mastery points, log-scaled.
+
+    python scraper/draft.py --role middle --allies leesin:jungle ornn:top \\
+        --enemies zed:middle vi:jungle --bans yasuo yone --puuid <PUUID>
+
+Needs the matchup matrix (python scraper/matrix.py). Masteries come from the
+Riot collector's CM_FOLDER/<puuid>.json, or the API when not saved yet.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from matrix import MatchupMatrix, latest_patch
+from registry import registry
+from schema import TIERLIST
+
+TIERLIST_FILE = "lolalytics_champions_all.csv"
+
+# Score weights: deltas and win rates are in percentage points
+WEIGHTS = {"counter": 1.0, "synergy": 0.5, "role": 1.0, "mastery": 2.0}
+DELTA = "delta_1"
+
+# CM_FOLDER is shared with the Riot collector's .env
+load_dotenv()
+
+def normalize(name):
+    """Any spelling of a champion -> its slug"""
+    code = registry().code(name)
+    if code is None:
+        raise ValueError(f"Unknown champion: {name}")
+    return registry().slug(code)
+
+def parse_picks(picks):
+    """["zed:middle", "vi"] -> [("zed", "middle"), ("vi", None)]"""
+    parsed = []
+    for pick in picks or []:
+        champion, _, role = pick.partition(":")
+        parsed.append((normalize(champion), role or None))
+    return parsed
+
+def load_masteries(puuid):
+    """Champion mastery entries for a player: saved by the collector, else from the API"""
+    saved = Path(os.getenv("CM_FOLDER", "champion_masteries")) / f"{puuid}.json"
+    if saved.exists():
+        return json.loads(saved.read_text())
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "api"))
+    from riot_api import get_champion_masteries
+    return get_champion_masteries(puuid)
+
+class DraftRecommender:
+    """Holds the matchup arrays and per-champion tables; one recommend() per pick"""
+
+    def __init__(self, tierlist_file=TIERLIST_FILE):
+        self.counter = MatchupMatrix("counter")
+        # Synergy is optional: counters alone still rank picks
+        self.synergy = MatchupMatrix("synergy") if "synergy" in self.counter.relations else None
+        self.names = np.array(self.counter.names)
+        self.ids = self.counter.ids
+        self.roles = self.counter.roles
+        self.delta = self.counter.stats[DELTA]
+
+        # Champion x role tier list win rate (NaN where the champion is not played there)
+        self.role_win_rate = np.full((len(self.names), len(self.roles)), np.nan, dtype=np.float32)
+        if os.path.exists(tierlist_file):
+            df = pd.read_csv(tierlist_file, dtype=TIERLIST)
+            if "patch" in df.columns and df["patch"].notna().any():
+                df = df[df["patch"] == latest_patch(df["patch"].dropna().unique())]
+            i = df["name"].map(self.counter.codes)
+            r = df["role"].map(self.roles)
+            keep = (i.notna() & r.notna()).to_numpy()
+            self.role_win_rate[i[keep].astype(np.intp), r[keep].astype(np.intp)] = (
+                df["win_rate"].to_numpy(dtype=np.float32, na_value=np.nan)[keep]
+            )
+        self.has_tierlist = not np.isnan(self.role_win_rate).all()
+
+    def mastery_points(self, puuid):
+        """Mastery points per champion index for a player"""
+        points = np.zeros(len(self.names), dtype=np.float32)
+        if not puuid:
+            return points
+        # Mastery entries carry the same champion codes as the matrix
+        for entry in load_masteries(puuid):
+            if entry["championId"] in self.counter.codes:
+                points[self.counter.codes[entry["championId"]]] = entry["championPoints"]
+        return points
+
+    def _pair_deltas(self, matrix, picks, role):
+        """Candidate x pick deltas in the pick's role, mirrored from the pick's page where missing"""
+        if not picks or matrix is None:
+            return np.zeros((len(self.names), 0), dtype=np.float32)
+        cols = []
+        for champion, pick_role in picks:
+            j = self.ids[champion]
+            if pick_role:
+                own = matrix.values[:, j, self.roles[pick_role], self.delta]
+            else:
+                # Role unknown: average over every lane it was scraped in
+                found = ~matrix.missing[:, j, :]
+                total = np.where(found, matrix.values[:, j, :, self.delta], 0).sum(axis=1)
+                own = np.where(found.any(axis=1), total / np.maximum(found.sum(axis=1), 1), np.nan)
+            mirrored = -matrix.values[j, :, self.roles[role], self.delta]
+            cols.append(np.where(np.isnan(own), mirrored, own))
+        return np.nan_to_num(np.column_stack(cols))
+
+    def recommend(self, role, allies=(), enemies=(), bans=(), puuid=None, top=5):
+        """Top picks for a role given the draft so far, best first"""
+        r = self.roles[role]
+        for champion, _ in list(allies) + list(enemies):
+            if champion not in self.ids:
+                raise ValueError(f"Unknown champion: {champion}")
+
+        available = np.ones(len(self.names), dtype=bool)
+        for champion in [c for c, _ in allies] + [c for c, _ in enemies] + [normalize(b) for b in bans]:
+            if champion in self.ids:
+                available[self.ids[champion]] = False
+        if self.has_tierlist:
+            available &= ~np.isnan(self.role_win_rate[:, r])
+
+        mastery = self.mastery_points(puuid)
+        parts = {
+            "counter": self._pair_deltas(self.counter, enemies, role).sum(axis=1),
+            "synergy": self._pair_deltas(self.synergy, allies, role).sum(axis=1),
+            "role": np.nan_to_num(self.role_win_rate[:, r] - 50),
+            "mastery": np.log1p(mastery) / max(np.log1p(mastery.max()), 1),
+        }
+        score = sum(WEIGHTS[name] * part for name, part in parts.items())
+        score = np.where(available, score, -np.inf)
+
+        best = np.argsort(-score)[:top]
+        return [
+            {"champion": self.names[i], "score": round(float(score[i]), 2),
+             **{name: round(float(part[i]), 2) for name, part in parts.items()},
+             "mastery_points": int(mastery[i])}
+            for i in best if available[i]
+        ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend picks for the current draft")
+    parser.add_argument("--role", required=True, help="role to fill: top, jungle, middle, bottom, support")
+    parser.add_argument("--allies", nargs="*", help="ally picks as champion[:role]")
+    parser.add_argument("--enemies", nargs="*", help="enemy picks as champion[:role]")
+    parser.add_argument("--bans", nargs="*", default=[])
+    parser.add_argument("--puuid", help="player to weigh champion mastery for")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    recommender = DraftRecommender()
+    picks = recommender.recommend(args.role, parse_picks(args.allies), parse_picks(args.enemies),
+                                  args.bans, args.puuid, args.top)
+    print(pd.DataFrame(picks).to_string(index=False))
@@ -0,0 +1,80 @@
+"""
+Pooled, polite plain-HTTP fetching for pages whose data is in the served HTML.
+
+Pacing and concurrency per host come from the adaptive controllers in
+politeness.py.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from browser import USER_AGENT
+from politeness import controller_for, looks_blocked, parse_retry_after
+from profiling import profiler
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+def make_session(pool_size):
+    """requests session with a connection pool sized for the worker count"""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # 429 and 503 are not retried here: they go back to the host's controller,
+    # which backs off and honours their Retry-After
+    retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 504],
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class BlockedError(Exception):
+    """The host served a challenge or block page instead of content"""
+
+def fetch_all(jobs, workers=8, timeout=20):
+    """
+    Fetch (key, url) jobs concurrently and yield (key, url, html, error) as
+    each one completes. How many requests are in flight per host and how far
+    apart they start is adapted to the host's responses, up to `workers`.
+    """
+    session = make_session(workers)
+
+    def fetch(url):
+        controller = controller_for(url)
+        with profiler.phase("sleep", url):
+            token = controller.acquire()
+        outcome, retry_after = "error", None
+        try:
+            with profiler.phase("navigate"):
+                r = session.get(url, timeout=timeout)
+            if r.status_code in (429, 503):
+                outcome = "throttled"
+                retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            r.raise_for_status()
+            if looks_blocked(r.text):
+                outcome = "blocked"
+                raise BlockedError(f"challenge page from {url}")
+            outcome = "ok"
+            return r.text
+        finally:
+            controller.release(token, outcome, retry_after)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, url): (key, url) for key, url in jobs}
+        for future in as_completed(futures):
+            key, url = futures[future]
+            try:
+                yield key, url, future.result(), None
+            except Exception as e:
+                yield key, url, None, e
+    session.close()
@@ -0,0 +1,266 @@
+"""
+Local stand-in for the scraped sites, to test and benchmark the scrapers offline.
+
+Serves recorded and generated pages with the site's host as the first path
+segment, so a sweep planned with SITE_OVERRIDE loads them instead of the
+live sites:
+
+    /lolalytics.com/lol/<champion>/build/?...    build page (example.html) with working filter tabs
+    /lolalytics.com/lol/tierlist/?lane=...       virtualised tier list, rows only rendered while in view
+    /u.gg/lol/champions/<champion>/build         champion page, hydrated after load, stats in __SSR_DATA__
+    /www.leagueofgraphs.com/champions/stats/...  stats page with the graphDD13 plot (example1.html)
+
+    python scraper/fixtures.py --port 8765 --latency 0.2
+    SITE_OVERRIDE=http://127.0.0.1:8765 PATCH=15.19 python scraper/scraperwinrate-rankgame.py
+
+--latency delays every response (plus up to --jitter seconds), --render-ms
+delays what the page does in the browser: tab switches, lazy rows and
+hydration. Generated numbers are seeded by page, so every run sees the same
+site.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from champions import CHAMPIONS
+from parsers import MATCHUP_FLEX, MATCHUP_SCROLL, UGG_RANK_IDS, UGG_WORLD
+
+HERE = Path(__file__).resolve().parent
+BUILD_PAGE = HERE / "example.html"
+STATS_PAGE = HERE / "example1.html"
+
+DEFAULT_PORT = 8765
+ROW_HEIGHT = 52  # px, as on the live tier list
+RENDER_BUFFER = 10  # rows rendered above and below the viewport
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+<script>const RENDER_MS = {render_ms};</script>
+{script}
+</body></html>"""
+
+# Filter buttons switch tabs after a render delay: the clicked one becomes
+# active and the matchup cards are re-rendered in a different order
+BUILD_SCRIPT = """<script>
+const CARDS = %s;
+document.addEventListener("click", (event) => {
+    const button = event.target.closest("div[data-type]");
+    if (!button) return;
+    setTimeout(() => {
+        for (const sibling of button.parentElement.children) {
+            sibling.classList.remove("bg-[#3a7e93]");
+            sibling.classList.add("bg-[#214753]");
+        }
+        button.classList.remove("bg-[#214753]");
+        button.classList.add("bg-[#3a7e93]");
+        for (const flex of document.querySelectorAll(CARDS)) {
+            flex.append(...Array.from(flex.children).reverse());
+        }
+    }, RENDER_MS);
+});
+</script>"""
+
+# Only the rows near the viewport exist in the DOM, like the live list
+TIERLIST_SCRIPT = """<script>
+const ROWS = %s;
+const LANE = %s;
+const HEIGHT = %d, BUFFER = %d;
+const list = document.getElementById("list");
+list.style.height = (ROWS.length * HEIGHT) + "px";
+
+function cell(content) {
+    return `<div class="my-auto justify-center">${content}</div>`;
+}
+
+function render() {
+    const first = Math.max(0, Math.floor(window.scrollY / HEIGHT) - BUFFER);
+    const last = Math.min(ROWS.length, Math.ceil((window.scrollY + window.innerHeight) / HEIGHT) + BUFFER);
+    const html = [];
+    for (let i = first; i < last; i++) {
+        const r = ROWS[i];
+        html.push(`<div class="flex h-[52px] justify-between text-[13px]" style="position:absolute;left:0;right:0;top:${i * HEIGHT}px">`
+            + cell(i + 1)
+            + cell(`<a href="/lol/${r.slug}/build/">${r.name}</a>`)
+            + cell(r.tier)
+            + cell(r.score)
+            + cell(`<img src="https://cdn5.lolalytics.com/lane27/${LANE}.webp" alt="${LANE} lane">`)
+            + cell(r.win_rate) + cell(r.pick_rate) + cell(r.ban_rate) + cell(r.pbi) + cell(r.games)
+            + `</div>`);
+    }
+    list.innerHTML = html.join("");
+}
+
+let pending = null;
+window.addEventListener("scroll", () => {
+    if (!pending) pending = setTimeout(() => { pending = null; render(); }, RENDER_MS);
+});
+setTimeout(render, RENDER_MS);
+</script>"""
+
+# The stats grid and build only appear once the page has hydrated
+UGG_SCRIPT = """<script>
+window.__SSR_DATA__ = %s;
+setTimeout(() => {
+    document.getElementById("root").innerHTML = %s;
+}, RENDER_MS);
+</script>"""
+
+UGG_RANKINGS_URL = "https://stats2.u.gg/lol/1.5/rankings/15_19/ranked_solo_5x5/{champion}/1.5.0.json"
+UGG_ROLE_IDS = ["1", "2", "3", "4", "5"]
+
+def seeded(*parts):
+    """Random numbers that are the same for a page on every run"""
+    return random.Random(":".join(map(str, parts)))
+
+def display_name(slug):
+    return slug.capitalize()
+
+def build_page(render_ms):
+    html = BUILD_PAGE.read_text(encoding="utf-8")
+    script = BUILD_SCRIPT % json.dumps(f"{MATCHUP_SCROLL} {MATCHUP_FLEX}")
+    return PAGE.format(title="Build", body=html, render_ms=render_ms, script=script)
+
+def tierlist_page(lane, tier, region, patch, render_ms):
+    rng = seeded("tierlist", lane, tier, region, patch)
+    rows = []
+    for slug in CHAMPIONS:
+        win_rate = rng.uniform(45, 55)
+        rows.append({
+            "slug": slug, "name": display_name(slug),
+            "tier": rng.choice(["S+", "S", "S-", "A+", "A", "A-", "B+", "B", "C"]),
+            "score": f"{rng.uniform(40, 80):.0f}",
+            "win_rate": f"{win_rate:.2f}", "pick_rate": f"{rng.uniform(0.5, 15):.2f}",
+            "ban_rate": f"{rng.uniform(0, 20):.2f}", "pbi": f"{rng.uniform(0, 100):.0f}",
+            "games": f"{rng.randint(500, 90000):,}",
+        })
+    rows.sort(key=lambda r: -float(r["win_rate"]))
+    script = TIERLIST_SCRIPT % (json.dumps(rows), json.dumps(lane), ROW_HEIGHT, RENDER_BUFFER)
+    return PAGE.format(title="Tier List", body='<div id="list" style="position:relative"></div>',
+                       render_ms=render_ms, script=script)
+
+def ugg_page(champion, render_ms):
+    rng = seeded("ugg", champion)
+    total_matches = 2_000_000
+    payload = {UGG_WORLD: {}}
+    for rank_id in UGG_RANK_IDS.values():
+        roles = {}
+        for role_id in rng.sample(UGG_ROLE_IDS, 2):
+            matches = rng.randint(1000, 60000)
+            bans = rng.randint(0, 40000)
+            stats = [round(matches * rng.uniform(0.45, 0.55)), matches, rng.randint(1, 60), 60] + [0] * 6
+            roles[role_id] = stats + [bans, total_matches]
+        payload[UGG_WORLD][rank_id] = roles
+
+    overall = max(payload[UGG_WORLD][UGG_RANK_IDS["overall"]].values(), key=lambda s: s[1])
+    labels = [
+        (rng.choice(["S+", "S", "A", "B", "C"]), "Tier"),
+        (f"{overall[0] / overall[1] * 100:.2f}%", "Win Rate"),
+        (f"{overall[2]} / {overall[3]}", "Rank"),
+        (f"{overall[1] / total_matches * 100:.2f}%", "Pick Rate"),
+        (f"{overall[10] / total_matches * 100:.2f}%", "Ban Rate"),
+        (f"{overall[1]:,}", "Matches"),
+    ]
+    stats_grid = "".join(f'<div><div class="font-extrabold">{value}</div><div>{label}</div></div>'
+                         for value, label in labels)
+    content = (f'<div class="grid grid-flow-col bg-purple-500">{stats_grid}</div>'
+               f'<div class="champion-recommended-build">{display_name(champion)} build</div>')
+    ssr = {UGG_RANKINGS_URL.format(champion=champion): {"data": payload}}
+    script = UGG_SCRIPT % (json.dumps(ssr), json.dumps(content))
+    return PAGE.format(title=f"{display_name(champion)} Build", body='<div id="root"></div>',
+                       render_ms=render_ms, script=script)
+
+def stats_page(champion, region, role, tier):
+    rng = seeded("leagueofgraphs", champion, region, role, tier)
+    curve = [[games, round(rng.uniform(40, 60), 2)] for games in range(0, 60, 10)]
+    html = re.sub(r"data:\s*\[\[.*?\]\]", f"data: {json.dumps(curve, separators=(',', ':'))}",
+                  STATS_PAGE.read_text(encoding="utf-8"), count=1)
+    return PAGE.format(title="Stats", body=html, render_ms=0, script="")
+
+def route(path, query, render_ms):
+    """(site, page html) for a request path, or None if nothing is served there"""
+    parts = [p for p in path.split("/") if p]
+    if len(parts) < 2:
+        return None
+    host, rest = parts[0], parts[1:]
+    arg = lambda name, default="": query.get(name, [default])[0]
+
+    if host == "lolalytics.com" and rest[:2] == ["lol", "tierlist"]:
+        return host, tierlist_page(arg("lane", "top"), arg("tier"), arg("region"), arg("patch"), render_ms)
+    if host == "lolalytics.com" and len(rest) == 3 and rest[0] == "lol" and rest[2] == "build":
+        return host, build_page(render_ms)
+    if host == "u.gg" and len(rest) == 4 and rest[:2] == ["lol", "champions"] and rest[3] == "build":
+        return host, ugg_page(rest[2], render_ms)
+    if host == "www.leagueofgraphs.com" and len(rest) >= 6 and rest[:2] == ["champions", "stats"]:
+        champion, region, role, tier = rest[2:6]
+        return host, stats_page(champion, region, role, tier)
+    return None
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency + random.uniform(0, server.jitter))
+        url = urlparse(self.path)
+        page = route(url.path, parse_qs(url.query), server.render_ms)
+        if page is None:
+            self.send_error(404)
+            return
+        site, html = page
+        with server.lock:
+            server.hits[site] += 1
+        body = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=DEFAULT_PORT, latency=0.0, jitter=0.0, render_ms=20, verbose=False):
+        super().__init__(("127.0.0.1", port), FixtureHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.render_ms = render_ms
+        self.verbose = verbose
+        self.hits = Counter()  # pages served per site
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve from a background thread; returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the fixture sites locally")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--render-ms", type=int, default=20, help="delay of tab switches, lazy rows and hydration")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.port, args.latency, args.jitter, args.render_ms, args.verbose)
+    print(f"🧪 Fixture sites on {server.url} (SITE_OVERRIDE={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,140 +1,205 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-import pandas as pd
-import time
-import re
-
-# Setup Chrome options
-options = Options()
-# options.add_argument("--headless")
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-driver = webdriver.Chrome(options=options)
-
-def clean_value(text):
-    """Clean and convert text to appropriate numeric type"""
-    if "\n" in text:
-        text = text.split("\n")[0]
-    cleaned = text.replace('%', '').replace(',', '').strip()
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlparse, parse_qs
+
+from browser import TABS, browser_session, scrape_tabs
+from checkpoint import CsvCheckpoint
+from parsers import parse_tierlist_rows, role_from_lane_src
+from politeness import controller_for
+from profiling import profiler
+from refresh import RefreshLedger
+from schema import TIERLIST
+from snapshots import REPARSE, store_from_env
+from sweep import item_cell, load_plan, schedule
+
+# Optional page snapshots (SNAPSHOT_DIR); --reparse works from them without a browser
+store = store_from_env()
+
+# Chrome with the lean scraping profile, started when the script runs
+driver = None
+
+ROW_SELECTOR = "div.flex.h-\\[52px\\].justify-between.text-\\[13px\\]"
+SOURCE = "lolalytics_tierlist"
+TIERLIST_URL = "https://lolalytics.com/lol/tierlist/?lane={lane}&tier={tier}&region={region}&patch={patch}"
+COLUMNS = ["name", "role", "win_rate", "pick_rate", "ban_rate", "pbi", "num_games", "tier", "region", "patch"]
+
+# Scroll one step, give the virtualised list a couple of frames to render,
+# then read every row currently in the DOM. One round trip per step.
+COLLECT_ROWS_JS = """
+const [selector, fraction, done] = arguments;
+window.scrollBy(0, window.innerHeight * fraction);
+requestAnimationFrame(() => requestAnimationFrame(() => setTimeout(() => {
+    const rows = [];
+    for (const row of document.querySelectorAll(selector)) {
+        const cells = row.querySelectorAll("div.my-auto.justify-center");
+        if (cells.length < 9) continue;  // skip incomplete rows
+        const link = row.querySelector("a[href*='/build']");
+        const laneImg = cells[4].querySelector("img[alt*='lane']");
+        rows.push({
+            key: link ? link.getAttribute("href") : null,
+            lane_src: laneImg ? laneImg.getAttribute("src") : null,
+            texts: Array.from(cells, c => c.innerText.trim()).filter(t => t),
+        });
+    }
+    const atBottom = window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;
+    done({rows: rows, atBottom: atBottom});
+}, 50)));
+"""
+
+SCROLL_FRACTION = 0.8  # of the viewport, so consecutive steps overlap
+MAX_STEPS = 200
+IDLE_STEPS = 3  # steps at the bottom without new rows before giving up
+
+def scrape_champion_data(url, lane):
+    if store:
+        snapshot = store.load(url)
+        if snapshot:
+            print(f"💾 Using stored snapshot for lane: {lane}")
+            return parse_tierlist_rows(snapshot.state)
+
+    # The host's controller spaces out live page loads
+    controller = controller_for(url)
+    with profiler.phase("sleep", url):
+        token = controller.acquire()
+    data = []
     try:
-        num = float(cleaned)
-        return int(num) if num.is_integer() else num
-    except ValueError:
-        return cleaned
-
-def get_role_from_lane_icon(section):
-    """Extract role from the lane icon"""
-    try:
-        lane_img = section.find_element(By.CSS_SELECTOR, "img[alt*='lane']")
-        src = lane_img.get_attribute('src')
-        
-        if 'top.webp' in src:
-            return 'top'
-        elif 'middle.webp' in src:
-            return 'middle'
-        elif 'jungle.webp' in src:
-            return 'jungle'
-        elif 'bottom.webp' in src:
-            return 'bottom'
-        elif 'support.webp' in src:
-            return 'support'
-    except:
-        pass
-    return None
+        data = load_tierlist(url)
+        return data
+    finally:
+        controller.release(token, "ok" if data else "error")
 
-def scrape_champion_data(lane):
-    url = f"https://lolalytics.com/lol/tierlist/?lane={lane}&tier=diamond&region=sg&patch=15.19"
-    driver.get(url)
+def load_tierlist(url):
+    """Load a tier list page and collect its rows by scrolling through it"""
+    with profiler.phase("navigate", url):
+        driver.get(url)
     try:
         # Wait for at least one row
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "div.flex.h-\\[52px\\].justify-between.text-\\[13px\\]")
+        with profiler.phase("wait"):
+            WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ROW_SELECTOR))
             )
-        )
-        time.sleep(2)  # let initial page render
-
-        data = []
-        seen_rows = set()
-        last_count = 0
-
-        while True:
-            # Find all currently loaded rows
-            champions = driver.find_elements(
-                By.CSS_SELECTOR, "div.flex.h-\\[52px\\].justify-between.text-\\[13px\\]"
-            )
-
-            # Break if no new rows are loaded
-            if len(champions) == last_count:
-                break
-            last_count = len(champions)
-
-            for i, c in enumerate(champions):
-                if c in seen_rows:
-                    continue  # skip already processed
-                seen_rows.add(c)
-
-                # Scroll row into view
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({behavior: 'auto', block: 'center'});", c
-                )
-                time.sleep(0.3)
-
-                cells = c.find_elements(By.CSS_SELECTOR, "div.my-auto.justify-center")
-                if len(cells) < 9:  # skip incomplete rows
-                    continue
-
-                role = get_role_from_lane_icon(cells[4])
-                texts = [cell.text.strip() for cell in cells if cell.text.strip()]
-
-                name = texts[1]
-                win_rate = clean_value(texts[4])
-                pick_rate = clean_value(texts[5])
-                ban_rate = clean_value(texts[6])
-                pbi = clean_value(texts[7])
-                num_games = clean_value(texts[8])
-
-                print(f"🔍 Scraping {len(seen_rows)} champions - {name}")
-                data.append([name, role, win_rate, pick_rate, ban_rate, pbi, num_games])
-
-            # Scroll to bottom to trigger lazy loading
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)  # wait for new rows to load
-        
-        return data
-
     except TimeoutException:
         print(f"⏱ Timeout loading page: {url}")
         return []
 
+    return collect_rows(driver, url)
+
+def collect_rows(page, url):
+    """Collect the rows of a loaded tier list page by scrolling through it"""
+    page.set_script_timeout(10)
+
+    raw_rows = {}
+    idle = 0
+    fraction = 0  # first call reads the rows already on screen
+    for _ in range(MAX_STEPS):
+        with profiler.phase("extract"):
+            result = page.execute_async_script(COLLECT_ROWS_JS, ROW_SELECTOR, fraction)
+        fraction = SCROLL_FRACTION
+
+        new_rows = 0
+        for row in result["rows"]:
+            # Dedupe by champion (build link, falling back to the name)
+            key = row["key"] or "|".join(row["texts"])
+            if key in raw_rows:
+                continue
+            raw_rows[key] = {"role": role_from_lane_src(row["lane_src"]), "texts": row["texts"]}
+            new_rows += 1
+
+        if new_rows:
+            print(f"🔍 Scraped {len(raw_rows)} champions")
+        idle = idle + 1 if result["atBottom"] and not new_rows else 0
+        if idle >= IDLE_STEPS:
+            break
+
+    raw_rows = list(raw_rows.values())
+
+    # The rows only exist while scrolled into view, so store what was read
+    if store:
+        with profiler.phase("write"):
+            store.save(url, state=raw_rows)
+
+    with profiler.phase("parse"):
+        return parse_tierlist_rows(raw_rows)
+
+def scrape_one_by_one(items):
+    """Scrape tier list pages in turn in the session's browser; yields (item, data, error)"""
+    for item in items:
+        print(f"\n🚀 Starting scrape for lane: {item.role} ({item.tier}, {item.region}, {item.patch})")
+        try:
+            yield item, scrape_champion_data(item.url, item.role), None
+        except Exception as e:
+            yield item, None, e
+
+def load_stored_lane(item):
+    """Tier list rows of a lane from a stored page, or None"""
+    snapshot = store.load(item.url) if store else None
+    if snapshot:
+        print(f"💾 Using stored snapshot for lane: {item.role}")
+        return parse_tierlist_rows(snapshot.state)
+    return None
+
+def scrape_in_tabs(items):
+    """Scrape tier list pages as tabs of one browser; yields (item, data, error)"""
+    return scrape_tabs(items, load_stored_lane, ROW_SELECTOR, lambda page, item: collect_rows(page, item.url))
+
+def with_page(data, tier, region, patch):
+    """Tag each tier list row with the page it came from"""
+    return [row + [tier, region, patch] for row in data]
+
 def main():
-    all_data = []
-    lanes = ['top', 'jungle', 'middle', 'bottom', 'support']
-    for lane in lanes:
-        print(f"\n🚀 Starting scrape for lane: {lane}")
-        data = scrape_champion_data(lane)
+    items, run_id = ([], None) if REPARSE else load_plan(SOURCE)
+    output = CsvCheckpoint("lolalytics_champions_all.csv", COLUMNS, run_id=run_id, dtypes=TIERLIST)
+
+    if REPARSE:
+        # Rebuild the output from stored rows without a browser
+        output.reset()
+        for snapshot in store.matching(TIERLIST_URL.split("?")[0]):
+            query = {k: v[0] for k, v in parse_qs(urlparse(snapshot.url).query).items()}
+            if snapshot.state is not None and not output.is_done(snapshot.url):
+                data = parse_tierlist_rows(snapshot.state)
+                output.write(snapshot.url, with_page(data, query["tier"], query["region"], query["patch"]))
+                print(f"♻ Re-parsed lane: {query['lane']}")
+        return
+
+    # Pages fetched recently on their patch are reused from the ledger
+    ledger = RefreshLedger()
+    to_fetch, fresh = schedule(ledger, SOURCE, items)
+    for item, data in fresh:
+        if not output.is_done(item.url):
+            output.write(item.url, data)
+
+    remaining = []
+    for item in to_fetch:
+        if output.is_done(item.url):
+            print(f"\n⏭ Skipping lane already scraped: {item.role}")
+        else:
+            remaining.append(item)
+
+    results = scrape_in_tabs(remaining) if TABS else scrape_one_by_one(remaining)
+    for item, data, error in results:
+        lane = item.role
+        if error:
+            print(f"❌ Failed lane {lane}: {error}")
+            continue
         if not data:
             print(f"❌ No data scraped for lane: {lane}")
             continue
         else:
             print(f"✅ Scraped {len(data)} champions for lane: {lane}")
-            all_data.extend(data)
-
-    # --- Convert to DataFrame ---
-    df = pd.DataFrame(all_data, columns=["name", "role", "win_rate", "pick_rate", "ban_rate", "pbi", "num_games"])
-    print(df.head())
+            data = with_page(data, item.tier, item.region, item.patch)
+            ledger.record(SOURCE, item_cell(item), item.patch, data)
+            with profiler.phase("write"):
+                output.write(item.url, data)
 
-    # --- Save to CSV ---
-    df.to_csv("lolalytics_champions_all.csv", index=False)
-    print(f"\n✅ Saved {len(df)} champions to lolalytics_champions.csv")
+    output.complete()
+    print(f"\n✅ Saved {len(output.done)} lane pages to lolalytics_champions_all.csv")
 
 if __name__ == "__main__":
     try:
-        main()
+        # Tab mode starts its own browser
+        with browser_session(enabled=not (REPARSE or TABS)) as driver:
+            main()
     finally:
-        driver.quit()
-        print("\n🏁 Scraping completed!")
\ No newline at end of file
+        print("\n🏁 Scraping completed!")
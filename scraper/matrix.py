@@ -0,0 +1,156 @@
+"""
+Dense champion x champion x role matchup and synergy arrays.
+
+Compiles the long-format lolalytics tables into float32 arrays indexed by
+champion x other champion x role x stat, saved as .npy files that every
+consumer memory-maps instead of filtering DataFrames:
+
+- counter: champions_counters.csv (strong and weak against), other = opponent
+- synergy: champions_good_synergy.csv, other = ally
+
+Champions are indexed in registry order (registry.py); a boolean mask marks
+pairs without data and a JSON index maps slugs and champion codes to
+positions. Rebuild after scraping with:
+
+    python scraper/matrix.py [--tier diamond_plus] [--patch 15.19]
+
+and query with:
+
+    counters = MatchupMatrix("counter")
+    counters.get("ahri", "zed", "middle")            # -> {'win_rate': ..., ...}, any spelling or code
+    counters.values[counters.ids["ahri"], :, counters.roles["middle"], 0]
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from champions import CHAMPIONS
+from parsers import LANES
+from registry import registry
+from schema import MATCHUPS, SYNERGY
+
+PREFIX = "matchups"
+STATS = ("win_rate", "delta_1", "delta_2", "pick_rate", "games")
+ROLES = list(LANES)
+
+# Relation -> CSVs it can be built from, the first complete set wins
+RELATIONS = {
+    "counter": [["champions_counters.csv"], ["champions_strong_against.csv", "champions_weak_against.csv"]],
+    "synergy": [["champions_good_synergy.csv"]],
+}
+
+def _paths(prefix, relation):
+    prefix = Path(prefix)
+    return (
+        prefix.with_name(f"{prefix.name}_{relation}.npy"),
+        prefix.with_name(f"{prefix.name}_{relation}_missing.npy"),
+    )
+
+def _index_path(prefix):
+    prefix = Path(prefix)
+    return prefix.with_name(prefix.name + "_index.json")
+
+def latest_patch(patches):
+    """Newest "major.minor" patch from a column of patch strings"""
+    return max(patches, key=lambda p: tuple(int(x) for x in str(p).split(".") if x.isdigit()))
+
+def read_relation(relation, tier=None, patch=None):
+    """Long-format rows of a relation for one tier and patch, or None if not scraped"""
+    for files in RELATIONS[relation]:
+        if all(os.path.exists(f) for f in files):
+            # Typed as written: patches stay strings (15.20 is not 15.2), stats float32
+            dtypes = SYNERGY if relation == "synergy" else MATCHUPS
+            df = pd.concat([pd.read_csv(f, dtype=dtypes) for f in files], ignore_index=True)
+            break
+    else:
+        return None
+
+    # Outputs from a sweep hold several tiers and patches; keep one slice
+    if "patch" in df.columns and df["patch"].notna().any():
+        df = df[df["patch"] == (patch or latest_patch(df["patch"].dropna().unique()))]
+    if "tier" in df.columns and df["tier"].notna().any():
+        df = df[df["tier"] == (tier or df["tier"].mode()[0])]
+    return df
+
+def build(prefix=PREFIX, tier=None, patch=None):
+    """Compile every scraped relation into memory-mapped arrays"""
+    frames = {relation: read_relation(relation, tier, patch) for relation in RELATIONS}
+    frames = {relation: df for relation, df in frames.items() if df is not None}
+
+    # Rows hold champion codes; positions follow the registry
+    names = list(CHAMPIONS)
+    codes = list(registry().codes)
+    ids = {code: i for i, code in enumerate(codes)}
+    roles = {role: i for i, role in enumerate(ROLES)}
+    shape = (len(names), len(names), len(ROLES))
+
+    for relation, df in frames.items():
+        values_file, missing_file = _paths(prefix, relation)
+        values = np.lib.format.open_memmap(values_file, mode="w+", dtype=np.float32, shape=shape + (len(STATS),))
+        missing = np.lib.format.open_memmap(missing_file, mode="w+", dtype=np.bool_, shape=shape)
+        values[:] = np.nan
+        missing[:] = True
+
+        # Column-wise: map codes and roles to indices and scatter every row in one assignment
+        i, j, r = df["champion"].map(ids), df["opponent"].map(ids), df["role"].map(roles)
+        keep = (i.notna() & j.notna() & r.notna()).to_numpy()
+        i, j, r = (s.to_numpy()[keep].astype(np.intp) for s in (i, j, r))
+        stats = np.column_stack([
+            df[stat].to_numpy(dtype=np.float32, na_value=np.nan)[keep] for stat in STATS
+        ])
+        values[i, j, r] = stats
+        missing[i, j, r] = np.isnan(stats[:, 0])
+        values.flush()
+        missing.flush()
+        print(f"✅ {relation}: {int((~missing).sum())} pairs from {len(df)} rows -> {values_file}")
+
+    # Which tier and patch each relation was built from
+    slices = {
+        relation: {col: str(df[col].iloc[0]) for col in ("tier", "patch") if col in df.columns and len(df)}
+        for relation, df in frames.items()
+    }
+    _index_path(prefix).write_text(json.dumps({
+        "champions": names, "codes": codes, "roles": ROLES, "stats": list(STATS), "relations": slices,
+    }))
+
+class MatchupMatrix:
+    """Read-only, memory-mapped view of one relation, shared across processes"""
+
+    def __init__(self, relation, prefix=PREFIX, mmap_mode="r"):
+        index = json.loads(_index_path(prefix).read_text())
+        values_file, missing_file = _paths(prefix, relation)
+        self.values = np.load(values_file, mmap_mode=mmap_mode)
+        self.missing = np.load(missing_file, mmap_mode=mmap_mode)
+        self.names = index["champions"]
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.codes = {code: i for i, code in enumerate(index["codes"])}
+        self.roles = {role: i for i, role in enumerate(index["roles"])}
+        self.stats = {stat: i for i, stat in enumerate(index["stats"])}
+        self.relations = index["relations"]
+
+    def index(self, champion):
+        """Position of a champion given by any spelling or code"""
+        code = registry().code(champion)
+        if code not in self.codes:
+            raise KeyError(champion)
+        return self.codes[code]
+
+    def get(self, champion, other, role):
+        """Stats for one pair in one role, or None when it was not scraped"""
+        i, j, r = self.index(champion), self.index(other), self.roles[role]
+        if self.missing[i, j, r]:
+            return None
+        return {stat: float(self.values[i, j, r, k]) for stat, k in self.stats.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile matchup/synergy CSVs into memory-mapped arrays")
+    parser.add_argument("--tier", help="tier to keep when the CSVs hold several")
+    parser.add_argument("--patch", help="patch to keep (default: newest in the CSVs)")
+    parser.add_argument("--prefix", default=PREFIX)
+    args = parser.parse_args()
+    build(args.prefix, args.tier, args.patch)
@@ -0,0 +1,151 @@
+"""
+HTML extractors shared by the live scrapers and the offline re-parse mode.
+
+Every function here works on a page source string, so the same code runs on
+a live `driver.page_source` and on a stored snapshot without a browser.
+Values are returned as the text on the page; schema.py converts whole
+columns to numbers when the table is written.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+MATCHUP_SECTION = "div.flex.h-\\[146px\\].mb-2.border"
+MATCHUP_SCROLL = "div.cursor-grab.overflow-y-hidden.overflow-x-scroll"
+MATCHUP_FLEX = "div.flex.gap-\\[6px\\]"
+UGG_STATS = "div.grid.grid-flow-col.bg-purple-500 div.font-extrabold"
+GRAPH_DD13 = re.compile(r'\$\.plot\(\$\("#graphDD13"\),\s*\[\{[^}]*data:\s*(\[\[.*?\]\])', re.DOTALL)
+LANES = ("top", "middle", "jungle", "bottom", "support")
+
+def role_from_lane_src(src):
+    """Map a lane icon URL to its role"""
+    for lane in LANES:
+        if src and f"{lane}.webp" in src:
+            return lane
+    return None
+
+def champion_name_from_img(alt, src):
+    """Normalise a champion name from an image's alt text or src"""
+    if alt and alt.strip():
+        return alt.lower().replace("'", "").replace(" ", "").replace(".", "")
+    if src:
+        match = re.search(r'/champ[^/]+/([^/\.]+)\.webp', src)
+        if match:
+            return match.group(1).lower()
+    return None
+
+def make_soup(html):
+    """Parse a page, dropping hidden tooltip templates"""
+    soup = BeautifulSoup(html, "html.parser")
+    for template in soup.find_all("q:template"):
+        template.decompose()
+    return soup
+
+def parse_matchups(html, champion, type_field, type_value):
+    """Extract the lolalytics matchup cards currently rendered on a build page"""
+    matchups = []
+    for section in make_soup(html).select(MATCHUP_SECTION):
+        lane_img = section.select_one("img[alt*='lane']")
+        role = role_from_lane_src(lane_img.get("src")) if lane_img else None
+        if not role:
+            continue
+
+        matchup_flex = section.select_one(f"{MATCHUP_SCROLL} {MATCHUP_FLEX}")
+        if matchup_flex is None:
+            continue
+
+        for card in matchup_flex.find_all("div", recursive=False):
+            img = card.select_one("img[src*='champ']")
+            if img is None:
+                continue
+            opponent = champion_name_from_img(img.get("alt"), img.get("src"))
+            if not opponent or opponent == champion.lower():
+                continue
+
+            stat_divs = card.select("div.my-1")
+            if len(stat_divs) < 4:
+                continue
+
+            win_rate_span = stat_divs[0].find("span")
+            win_rate = (win_rate_span or stat_divs[0]).get_text(strip=True)
+            games_div = card.select_one("div.text-\\[9px\\]")
+
+            matchups.append({
+                'champion': champion,
+                'role': role,
+                type_field: type_value,
+                'opponent': opponent,
+                'win_rate': win_rate,
+                'delta_1': stat_divs[1].get_text(strip=True),
+                'delta_2': stat_divs[2].get_text(strip=True),
+                'pick_rate': stat_divs[3].get_text(strip=True),
+                'games': games_div.get_text(strip=True) if games_div else '0',
+            })
+    return matchups
+
+def parse_winrate_curve(html):
+    """Return the raw graphDD13 data string, or None when the page has no data"""
+    match = GRAPH_DD13.search(html)
+    if not match or match.group(1).strip() == "[[0,100]]":
+        return None
+    return match.group(1)
+
+def parse_ugg_stats(html):
+    """Extract the stat row texts from a U.GG champion page"""
+    return [el.get_text(strip=True) for el in make_soup(html).select(UGG_STATS)]
+
+def parse_tierlist_rows(raw_rows):
+    """Pick the output columns out of raw tierlist rows ({"role", "texts"})"""
+    data = []
+    for raw in raw_rows:
+        texts = raw["texts"]
+        if len(texts) < 9:
+            continue
+        data.append([
+            texts[1],  # name
+            raw["role"],
+            texts[4],  # win rate
+            texts[5],  # pick rate
+            texts[6],  # ban rate
+            texts[7],  # pbi
+            texts[8],  # games
+        ])
+    return data
+
+# U.GG stats payload: the rankings JSON the champion page loads from
+# stats2.u.gg (.../rankings/<patch>/ranked_solo_5x5/<champion key>/1.5.0.json),
+# nested as region id -> rank id -> role id -> stats list. It is not a
+# documented API: the ids are the ones u.gg uses in its own region and rank
+# filters (region 12 is "World", rank 8 "All Ranks"), and the list positions
+# below are where the page reads wins, matches, role rank, bans and the
+# rank's total games from. tests/test_parsers.py pins this layout with a
+# sample payload. If U.GG changes it, no rank parses and scraper.py fails
+# the page instead of writing placeholder rows.
+UGG_WORLD = "12"
+UGG_RANK_IDS = {
+    "overall": "8", "iron": "12", "bronze": "7", "silver": "6", "gold": "5",
+    "platinum": "4", "emerald": "17", "diamond": "3", "master": "2",
+    "grandmaster": "13", "challenger": "1",
+}
+UGG_WINS, UGG_MATCHES, UGG_RANK, UGG_TOTAL_RANK = 0, 1, 2, 3
+UGG_BANS, UGG_TOTAL_MATCHES = 10, 11
+
+def parse_ugg_rankings(payload, rank):
+    """Stats for one rank from the U.GG rankings payload, for the champion's main role"""
+    roles = payload.get(UGG_WORLD, {}).get(UGG_RANK_IDS[rank], {})
+    # Lists too short for the layout above are not stats this parser understands
+    roles = [stats for stats in roles.values() if isinstance(stats, list) and len(stats) > UGG_TOTAL_MATCHES]
+    if not roles:
+        return None
+    stats = max(roles, key=lambda s: s[UGG_MATCHES])
+    wins, matches, total = stats[UGG_WINS], stats[UGG_MATCHES], stats[UGG_TOTAL_MATCHES]
+    if not matches or not total:
+        return None
+    return {
+        "win_rate": round(wins / matches * 100, 2),
+        "rank": f"{stats[UGG_RANK]} / {stats[UGG_TOTAL_RANK]}",
+        "pick_rate": round(matches / total * 100, 2),
+        "ban_rate": round(stats[UGG_BANS] / total * 100, 2),
+        "matches": matches,
+    }
@@ -0,0 +1,141 @@
+"""
+Adaptive per-host concurrency and request spacing (AIMD).
+
+Each host gets a controller that decides how many pages may be in flight
+and how far apart requests start. Fast, successful responses raise the
+in-flight limit additively (about +1 per window of responses) and shorten
+the spacing. Errors, timeouts, throttling (429/503) and challenge pages
+halve the limit, double the spacing and, with Retry-After, pause the host.
+The limit never exceeds the host's cap:
+
+    HOST_CAPS=lolalytics.com=4,u.gg=4,www.leagueofgraphs.com=8
+
+    controller = controller_for(url)
+    token = controller.acquire()
+    ...load the page...
+    controller.release(token, outcome)   # "ok", "error", "throttled" or "blocked"
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+DEFAULT_CAPS = {"lolalytics.com": 4, "u.gg": 4, "www.leagueofgraphs.com": 8}
+DEFAULT_CAP = 4
+
+MIN_INTERVAL = 0.25  # seconds between request starts at full speed
+START_INTERVAL = 1.0
+MAX_INTERVAL = 30.0
+SLOW_FACTOR = 3  # a response this many times slower than the best seen counts as congestion
+
+# Text that only shows up on bot challenge / block pages
+BLOCK_MARKERS = ("cf-challenge", "challenge-platform", "<title>Just a moment...</title>",
+                 "<title>Attention Required!")
+
+def host_caps():
+    caps = dict(DEFAULT_CAPS)
+    for entry in filter(None, os.getenv("HOST_CAPS", "").split(",")):
+        host, _, cap = entry.partition("=")
+        caps[host.strip()] = int(cap)
+    return caps
+
+def looks_blocked(html):
+    """Whether a page is a challenge or block page instead of content"""
+    head = (html or "")[:20000]
+    return any(marker in head for marker in BLOCK_MARKERS)
+
+class HostController:
+    def __init__(self, host, cap):
+        self.host = host
+        self.cap = cap
+        self.limit = 1.0
+        self.interval = START_INTERVAL
+        self.in_flight = 0
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+        self.best_latency = None
+        self.cond = threading.Condition()
+
+    def _ready(self, now):
+        return self.in_flight < int(self.limit) and now >= max(self.next_slot, self.paused_until)
+
+    def try_acquire(self):
+        """Start a request now if the host allows it; returns a token or None"""
+        with self.cond:
+            now = time.monotonic()
+            if not self._ready(now):
+                return None
+            self.in_flight += 1
+            self.next_slot = now + self.interval
+            return now
+
+    def acquire(self):
+        """Block until a request may start; returns a token for release()"""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                if self._ready(now):
+                    self.in_flight += 1
+                    self.next_slot = now + self.interval
+                    return now
+                wait = max(self.next_slot, self.paused_until) - now
+                self.cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, token, outcome="ok", retry_after=None):
+        """Finish a request and adapt the limit and spacing to how it went"""
+        latency = time.monotonic() - token
+        with self.cond:
+            self.in_flight -= 1
+            if outcome == "ok":
+                self.best_latency = latency if self.best_latency is None else min(self.best_latency, latency)
+                if latency > SLOW_FACTOR * self.best_latency:
+                    outcome = "slow"
+
+            if outcome == "ok":
+                # Additive increase: about one more page in flight per window of successes
+                self.limit = min(self.cap, self.limit + 1 / self.limit)
+                self.interval = max(MIN_INTERVAL, self.interval * 0.9)
+            elif outcome == "slow":
+                self.interval = min(MAX_INTERVAL, self.interval * 1.25)
+            else:
+                # Multiplicative decrease on errors, throttling and challenge pages
+                previous = int(self.limit)
+                self.limit = max(1.0, self.limit / 2)
+                self.interval = min(MAX_INTERVAL, self.interval * 2)
+                if retry_after:
+                    self.paused_until = time.monotonic() + retry_after
+                if int(self.limit) != previous:
+                    print(f"🐢 {self.host}: {outcome}, backing off to {int(self.limit)} in flight, "
+                          f"{self.interval:.1f}s apart")
+            self.cond.notify_all()
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (seconds or an HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+controllers = {}
+controllers_lock = threading.Lock()
+
+def controller_for(url):
+    """The shared controller of a URL's host"""
+    host = urlparse(url).hostname or url
+    with controllers_lock:
+        if host not in controllers:
+            caps = host_caps()
+            controllers[host] = HostController(host, caps.get(host, DEFAULT_CAP))
+        return controllers[host]
@@ -0,0 +1,126 @@
+"""
+Phase-level timing for scraper runs.
+
+Set SCRAPER_PROFILE to a file name to time every phase of every page
+(navigate, wait, sleep, click, extract, parse, write) and count the
+WebDriver commands each page needed:
+
+    SCRAPER_PROFILE=trace.json python scraper/scraplolalytics.py
+
+At exit the trace is written in Chrome trace-event format (open it in
+chrome://tracing or https://ui.perfetto.dev) and a percentile summary per
+phase is printed. Without SCRAPER_PROFILE the phases cost nothing.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+PHASES = ("navigate", "wait", "sleep", "click", "extract", "parse", "write")
+
+class Profiler:
+    def __init__(self, trace_file=None):
+        self.trace_file = trace_file
+        self.enabled = trace_file is not None
+        self.events = []
+        self.round_trips = Counter()  # url -> WebDriver commands
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.t0 = time.perf_counter()
+        self.threads = {}
+
+    def _tid(self):
+        ident = threading.get_ident()
+        with self.lock:
+            return self.threads.setdefault(ident, len(self.threads) + 1)
+
+    def phase(self, name, url=None):
+        """Time a block as one phase; a url also attributes later WebDriver commands to that page"""
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name, url)
+
+    @contextmanager
+    def _phase(self, name, url):
+        if url is not None:
+            self.local.url = url
+        url = getattr(self.local, "url", None)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name, "cat": "phase", "ph": "X", "pid": 1, "tid": self._tid(),
+                "ts": (start - self.t0) * 1e6, "dur": (end - start) * 1e6,
+                "args": {"url": url},
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def sleep(self, seconds):
+        """time.sleep recorded as a sleep phase"""
+        with self.phase("sleep"):
+            time.sleep(seconds)
+
+    def instrument(self, driver):
+        """Count every WebDriver command (one HTTP round trip to chromedriver) per page"""
+        if not self.enabled:
+            return driver
+        execute = driver.execute
+
+        def counted(command, params=None):
+            url = getattr(self.local, "url", None)
+            with self.lock:
+                self.round_trips[url] += 1
+            return execute(command, params)
+
+        driver.execute = counted
+        return driver
+
+    def summary(self):
+        """Percentiles per phase and round trips per page"""
+        durations = defaultdict(list)
+        for event in self.events:
+            durations[event["name"]].append(event["dur"] / 1000)
+
+        lines = [f"{'phase':<10}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'total s':>10}"]
+        for name in sorted(durations, key=lambda n: PHASES.index(n) if n in PHASES else len(PHASES)):
+            ms = np.array(durations[name])
+            p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+            lines.append(f"{name:<10}{len(ms):>7}{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{ms.max():>10.1f}{ms.sum() / 1000:>10.2f}")
+
+        trips = np.array([n for url, n in self.round_trips.items() if url is not None])
+        if len(trips):
+            p50, p90 = np.percentile(trips, [50, 90])
+            lines.append(f"WebDriver round trips per page: p50 {p50:.0f}, p90 {p90:.0f}, max {trips.max()}, "
+                         f"total {sum(self.round_trips.values())} over {len(trips)} pages")
+        return "\n".join(lines)
+
+    def save(self):
+        """Write the Chrome trace and print the summary"""
+        if not self.events:
+            return
+        counters = [
+            {"name": "webdriver round trips", "cat": "webdriver", "ph": "i", "s": "g", "pid": 1, "tid": 0,
+             "ts": (time.perf_counter() - self.t0) * 1e6, "args": {url: n for url, n in self.round_trips.items()}}
+        ]
+        with open(self.trace_file, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events + counters, "displayTimeUnit": "ms"}, f)
+        print(f"\n⏱ Profile written to {self.trace_file}")
+        print(self.summary())
+
+def profiler_from_env():
+    profiler = Profiler(os.getenv("SCRAPER_PROFILE"))
+    if profiler.enabled:
+        atexit.register(profiler.save)
+    return profiler
+
+# One profiler per process, shared by the scraper and its helper modules
+profiler = profiler_from_env()
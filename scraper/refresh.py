@@ -0,0 +1,155 @@
+"""
+Patch-aware incremental refresh ledger for the scrapers.
+
+Every scraped cell (source, champion, role, tier, region, patch) is recorded
+in a SQLite ledger with its last fetch time, a hash of the extracted rows and
+the rows themselves. Each run then:
+
+- detects the current patch from Data Dragon (override with PATCH=15.19),
+- fetches cells that are new for the patch or stale first, highest priority
+  first (explicit priority, then how often the cell has changed),
+- reuses the stored rows for cells fetched recently, backing off further for
+  cells whose content came back unchanged several times in a row.
+
+Mark champions as high priority (e.g. ones changed in the patch notes) with:
+
+    python scraper/refresh.py prioritize <source> <champion> [<champion> ...]
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+import requests
+
+Cell = namedtuple("Cell", ["champion", "role", "tier", "region"])
+
+ANY = "*"  # for cells that cover every champion or role on one page
+LEDGER_FILE = os.getenv("REFRESH_LEDGER", "refresh_ledger.sqlite")
+MAX_AGE_HOURS = float(os.getenv("REFRESH_MAX_AGE_HOURS", 24))
+MAX_BACKOFF = 4  # unchanged fetches double the max age up to 2**4 times
+
+VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+
+def current_patch():
+    """Latest live patch as "major.minor", e.g. "15.19" """
+    patch = os.getenv("PATCH")
+    if patch:
+        return patch
+    r = requests.get(VERSIONS_URL, timeout=10)
+    r.raise_for_status()
+    major, minor = r.json()[0].split(".")[:2]
+    return f"{major}.{minor}"
+
+def content_hash(rows):
+    return hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()
+
+class RefreshLedger:
+    def __init__(self, path=LEDGER_FILE, max_age_hours=MAX_AGE_HOURS):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.max_age = max_age_hours * 3600
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS cells (
+                source TEXT, champion TEXT, role TEXT, tier TEXT, region TEXT, patch TEXT,
+                fetched_at REAL, content_hash TEXT, unchanged INTEGER DEFAULT 0,
+                changes INTEGER DEFAULT 0, rows TEXT,
+                PRIMARY KEY (source, champion, role, tier, region, patch)
+            );
+            CREATE TABLE IF NOT EXISTS priorities (
+                source TEXT, champion TEXT, priority INTEGER,
+                PRIMARY KEY (source, champion)
+            );
+            CREATE TABLE IF NOT EXISTS patches (
+                source TEXT PRIMARY KEY, patch TEXT
+            );
+        """)
+
+    def check_patch(self, source, patch):
+        """Remember the patch for a source and report when it changed"""
+        row = self.db.execute("SELECT patch FROM patches WHERE source = ?", (source,)).fetchone()
+        if row and row[0] != patch:
+            print(f"🆕 New patch {patch} for {source} (was {row[0]})")
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO patches VALUES (?, ?)", (source, patch))
+
+    def set_priority(self, source, champion, priority=1):
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO priorities VALUES (?, ?, ?)", (source, champion, priority))
+
+    def plan(self, source, cells, patch):
+        """
+        Split cells into (to_fetch, fresh). to_fetch is ordered with the most
+        urgent first; fresh is a list of (cell, rows) that can be reused as is.
+        """
+        self.check_patch(source, patch)
+        priorities = dict(self.db.execute(
+            "SELECT champion, priority FROM priorities WHERE source = ?", (source,)
+        ))
+        # How often each cell changed on earlier patches, as a volatility hint
+        history = {
+            Cell(*key): changes for *key, changes in self.db.execute(
+                "SELECT champion, role, tier, region, SUM(changes) FROM cells "
+                "WHERE source = ? AND patch != ? GROUP BY champion, role, tier, region",
+                (source, patch),
+            )
+        }
+        known = {
+            Cell(*key): (fetched_at, unchanged, rows) for *key, fetched_at, unchanged, rows in self.db.execute(
+                "SELECT champion, role, tier, region, fetched_at, unchanged, rows FROM cells "
+                "WHERE source = ? AND patch = ?",
+                (source, patch),
+            )
+        }
+
+        now = time.time()
+        to_fetch, fresh = [], []
+        for cell in cells:
+            cell = Cell(*cell)
+            if cell in known:
+                fetched_at, unchanged, rows = known[cell]
+                max_age = self.max_age * 2 ** min(unchanged, MAX_BACKOFF)
+                if now - fetched_at < max_age:
+                    fresh.append((cell, json.loads(rows)))
+                    continue
+                age = now - fetched_at
+            else:
+                age = float("inf")  # never fetched on this patch
+            urgency = (priorities.get(cell.champion, 0), history.get(cell, 0), age)
+            to_fetch.append((urgency, cell))
+
+        to_fetch.sort(key=lambda item: item[0], reverse=True)
+        print(f"🗓 {source} {patch}: {len(to_fetch)} cells to fetch, {len(fresh)} up to date")
+        return [cell for _, cell in to_fetch], fresh
+
+    def record(self, source, cell, patch, rows):
+        """Store freshly extracted rows; returns whether the content changed"""
+        cell = Cell(*cell)
+        digest = content_hash(rows)
+        row = self.db.execute(
+            "SELECT content_hash, unchanged, changes FROM cells WHERE source = ? AND champion = ? "
+            "AND role = ? AND tier = ? AND region = ? AND patch = ?",
+            (source, *cell, patch),
+        ).fetchone()
+        changed = row is None or row[0] != digest
+        unchanged = 0 if changed else row[1] + 1
+        changes = (row[2] if row else 0) + (1 if changed and row else 0)
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, *cell, patch, time.time(), digest, unchanged, changes,
+                 json.dumps(rows, default=str)),
+            )
+        return changed
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "prioritize":
+        ledger = RefreshLedger()
+        for champion in sys.argv[3:]:
+            ledger.set_priority(sys.argv[2], champion)
+        print(f"✅ Prioritised {len(sys.argv) - 3} champions for {sys.argv[2]}")
+    else:
+        print(__doc__)
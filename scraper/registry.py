@@ -0,0 +1,108 @@
+"""
+Canonical champion ids shared by the Riot collector and the scrapers.
+
+Every champion is identified by Riot's numeric champion key (Aatrox = 266),
+a stable small integer that match-v5, champion mastery and spectator data
+already use. The registry maps every spelling seen anywhere to it: Riot's id
+("MonkeyKing", "FiddleSticks") and display name ("Nunu & Willump"), the URL
+slugs the sites use ("wukong", "nunu"), names normalised from image alt text
+("kaisa") and the key itself ("266"). Outputs store the key; joins between
+match data and scraped stats are integer joins.
+
+The table comes from champion_data.json next to this file (Data Dragon's
+champion.json plus the scrapers' slug for each champion) and is built once
+per process. When a new champion is released:
+
+    python scraper/registry.py update     # pull the latest Data Dragon list
+"""
+
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+DATA_FILE = Path(__file__).resolve().with_name("champion_data.json")
+VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+CHAMPIONS_URL = "https://ddragon.leagueoflegends.com/cdn/{version}/data/en_US/champion.json"
+
+# Champion codes fit in 16 bits; <NA> where a spelling is unknown
+CODE = "Int16"
+
+def normalize(name):
+    """Lowercase letters and digits only: "Kai'Sa" -> "kaisa", "Nunu & Willump" -> "nunuwillump" """
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+class ChampionRegistry:
+    def __init__(self, path=DATA_FILE):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        self.version = data.get("version")
+        self.codes = []
+        self.slugs = {}  # code -> slug used in the sites' URLs
+        self.names = {}  # code -> display name
+        self.aliases = {}  # normalised spelling -> code
+        for champion in sorted(data["data"].values(), key=lambda c: c["name"].casefold()):
+            code = int(champion["key"])
+            self.codes.append(code)
+            self.slugs[code] = champion["slug"]
+            self.names[code] = champion["name"]
+            for spelling in (champion["key"], champion["id"], champion["name"], champion["slug"]):
+                self.aliases[normalize(spelling)] = code
+        self.warned = set()
+
+    def code(self, spelling):
+        """Champion code for any spelling, or None"""
+        if spelling is None or (not isinstance(spelling, str) and pd.isna(spelling)):
+            return None
+        return self.aliases.get(normalize(spelling))
+
+    def encode(self, values):
+        """A column of spellings (names, slugs, ids, codes) as Int16 codes, in one pass"""
+        text = pd.Series(values, dtype="string").str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
+        codes = text.map(self.aliases, na_action="ignore")
+        unknown = set(text[codes.isna() & text.notna() & (text != "")].unique()) - self.warned
+        if unknown:
+            print(f"⚠ Unknown champions {sorted(unknown)}: run python scraper/registry.py update")
+            self.warned |= unknown
+        return codes.astype(CODE)
+
+    def slug(self, code):
+        return self.slugs[int(code)]
+
+    def name(self, code):
+        return self.names[int(code)]
+
+@lru_cache(maxsize=None)
+def registry(path=DATA_FILE):
+    """The process-wide registry, built on first use"""
+    return ChampionRegistry(path)
+
+def update(path=DATA_FILE):
+    """Refresh the data file from the latest Data Dragon list, keeping known slugs"""
+    version = requests.get(VERSIONS_URL, timeout=10).json()[0]
+    latest = requests.get(CHAMPIONS_URL.format(version=version), timeout=10).json()["data"]
+    known = json.loads(Path(path).read_text(encoding="utf-8"))["data"] if Path(path).exists() else {}
+
+    data = {}
+    for champion_id, champion in latest.items():
+        slug = known.get(champion_id, {}).get("slug") or normalize(champion["name"])
+        data[champion_id] = {"key": champion["key"], "id": champion_id, "name": champion["name"], "slug": slug}
+        if champion_id not in known:
+            print(f"➕ {champion['name']} ({champion['key']}) as '{slug}'")
+
+    # One champion per line keeps the diffs readable
+    lines = [f" {json.dumps(champion_id)}: {json.dumps(entry)}" for champion_id, entry in data.items()]
+    Path(path).write_text(
+        f'{{"type": "champion", "version": {json.dumps(version)}, "data": {{\n' + ",\n".join(lines) + "\n}}\n",
+        encoding="utf-8",
+    )
+    print(f"✅ {len(data)} champions from Data Dragon {version} -> {path}")
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["update"]:
+        update()
+    else:
+        print(__doc__)
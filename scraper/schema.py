@@ -0,0 +1,78 @@
+"""
+Typed output schemas for the scraped tables.
+
+Scrapers keep every cell as the text they read off the page ("52.31%",
+"1,204", "-"). A table is only converted when it is written, column by
+column in one vectorised pass per column instead of cell by cell:
+
+- rates, deltas and other measures -> float32,
+- counts -> nullable Int32,
+- champions -> Int16 registry codes (registry.py), whatever the spelling,
+- labels (role, tier, region, patch, view) -> categorical,
+
+with "", "-" and (in numeric columns) anything else that is not a number as
+NaN / <NA>, the one missing value every column uses. The CSVs are read
+back with the same dtypes, so patches stay strings and labels stay
+categorical downstream:
+
+    df = pd.read_csv("champions_counters.csv", dtype=MATCHUPS)
+"""
+
+import pandas as pd
+
+from registry import CODE, registry
+
+RATE = "float32"
+COUNT = "Int32"
+LABEL = "category"
+TEXT = "string"
+CHAMPION = CODE  # Int16 is only used for champion codes
+
+# Text that stands for "no value" in any column
+MISSING = ["", "-"]
+
+MATCHUPS = {
+    "champion": CHAMPION, "role": LABEL, "counter_type": LABEL, "opponent": CHAMPION,
+    "win_rate": RATE, "delta_1": RATE, "delta_2": RATE, "pick_rate": RATE, "games": COUNT,
+    "tier": LABEL, "patch": LABEL,
+}
+SYNERGY = {("synergy_type" if column == "counter_type" else column): kind for column, kind in MATCHUPS.items()}
+
+TIERLIST = {
+    "name": CHAMPION, "role": LABEL, "win_rate": RATE, "pick_rate": RATE, "ban_rate": RATE,
+    "pbi": RATE, "num_games": COUNT, "tier": LABEL, "region": LABEL, "patch": LABEL,
+}
+
+UGG = {
+    "Champion": CHAMPION, "Rank": LABEL, "Tier": LABEL, "Win Rate": RATE, "Role Rank": TEXT,
+    "Pick Rate": RATE, "Ban Rate": RATE, "Matches": COUNT,
+}
+
+WINRATE_CURVES = {"champion": CHAMPION, "role": LABEL, "data": TEXT, "tier": LABEL, "region": LABEL}
+
+def numbers(values):
+    """Page texts ("52.31%", "1,204", "-") to float64 in one pass, NaN where there is no number"""
+    text = pd.Series(values, dtype="string")
+    text = text.str.split("\n", n=1).str[0].str.replace(r"[%,]", "", regex=True).str.strip()
+    return pd.to_numeric(text, errors="coerce")
+
+def convert(values, kind):
+    """One column of raw values as its schema dtype"""
+    if kind == CHAMPION:
+        return registry().encode(values)
+    if kind in (RATE, COUNT):
+        parsed = numbers(values)
+        return parsed.astype(RATE) if kind == RATE else parsed.round().astype(COUNT)
+    text = pd.Series(values, dtype="string")
+    text = text.mask(text.str.strip().isin(MISSING))
+    return text.astype(kind)
+
+def table(rows, columns, dtypes):
+    """Rows (lists or dicts) as a DataFrame, converted column by column"""
+    if rows and isinstance(rows[0], dict):
+        values = {column: [row.get(column) for row in rows] for column in columns}
+    else:
+        values = dict(zip(columns, zip(*rows))) if rows else {column: () for column in columns}
+    return pd.DataFrame({
+        column: convert(list(values[column]), dtypes.get(column, TEXT)) for column in columns
+    })
@@ -1,88 +1,231 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
 
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
-options = Options()
-options.add_argument("--headless") 
-driver = webdriver.Chrome(options=options)
+from browser import TABS, make_driver, quit_driver, scrape_tabs
+from checkpoint import CsvCheckpoint
+from parsers import parse_ugg_stats, parse_ugg_rankings
+from politeness import controller_for, looks_blocked
+from profiling import profiler
+from refresh import RefreshLedger
+from schema import UGG
+from snapshots import REPARSE, store_from_env
+from sweep import item_cell, load_plan, schedule
 
-driver.get("https://u.gg/lol/champions")
-
-title = driver.title
-driver.implicitly_wait(10)  
+# Optional page snapshots (SNAPSHOT_DIR); --reparse works from them without a browser
+store = store_from_env()
 
 RANKS = ["overall", "iron", "bronze", "silver", "gold", "platinum", "emerald", "diamond", "master", "grandmaster", "challenger"]
 
-def format(arr):
-    for i in range(len(arr)):
-        cleaned_item = arr[i].replace('%', '').replace(',', '').strip()
+# Champions scraped at the same time, one browser each
+WORKERS = 4
+
+# With SCRAPER_TABS (browser.TABS) pages are loaded as tabs of a single
+# browser instead, for machines that cannot fit a browser per worker
+
+BUILD_SELECTOR = "div.champion-recommended-build"
+
+SOURCE = "ugg"
+
+# The champion page already loads the stats for every rank and role. Read it
+# from the server-rendered state, or fetch the URL the page requested itself.
+RANKINGS_PAYLOAD_JS = """
+const done = arguments[arguments.length - 1];
+const ssr = window.__SSR_DATA__ || {};
+for (const [key, value] of Object.entries(ssr)) {
+    if (key.includes("/rankings/") && value && value.data) { done(value.data); return; }
+}
+const entry = performance.getEntriesByType("resource")
+    .map(e => e.name)
+    .find(name => name.includes("stats2.u.gg") && name.includes("/rankings/"));
+if (!entry) { done(null); return; }
+fetch(entry).then(r => r.json()).then(done).catch(() => done(null));
+"""
+
+def champion_rows(champion, state, ranks=RANKS):
+    """One row per rank from a champion's stats payload"""
+    rows = []
+    for rank in ranks:
+        stats = parse_ugg_rankings(state["payload"], rank) if state["payload"] else None
+        if stats is None:
+            rows.append([champion, rank] + ["-"] * 6)
+            continue
+        # The tier letter is computed by the page, so it is only known for the loaded view
+        tier = state["tier"] if rank == "overall" else "-"
+        rows.append([champion, rank, tier, stats["win_rate"], stats["rank"],
+                     stats["pick_rate"], stats["ban_rate"], stats["matches"]])
+    return rows
+
+def reparse(output):
+    """Rebuild champions.csv from stored snapshots without a browser"""
+    output.reset()
+    by_champion = {}
+    for snapshot in store.matching("https://u.gg/lol/champions/"):
+        if snapshot.state:
+            champion = urlparse(snapshot.url).path.rstrip("/").split("/")[-2]
+            by_champion[champion] = snapshot.state
+
+    for champion in sorted(by_champion):
+        output.write(champion, champion_rows(champion, by_champion[champion]))
+        print(f"♻ Re-parsed {champion}")
+
+local = threading.local()
+workers = []
+workers_lock = threading.Lock()
+
+def worker_driver():
+    """Browser owned by the current worker thread"""
+    if not hasattr(local, "driver"):
+        local.driver = make_driver()
+        with workers_lock:
+            workers.append(local.driver)
+    return local.driver
+
+def scrape_champion(item):
+    """Load a champion page once and read the stats for every planned rank from it"""
+    champion, href, ranks = item.champion, item.url, item.views
+    snapshot = store.load(href) if store else None
+    if snapshot and snapshot.state:
+        print("Using stored snapshot:", href)
+        return champion, champion_rows(champion, snapshot.state, ranks)
+
+    controller = controller_for(href)
+    with profiler.phase("sleep", href):
+        token = controller.acquire()
+    rows = [[champion, rank] + ["-"] * 6 for rank in ranks]
+    try:
+        rows = load_champion(worker_driver(), item)
+        return champion, rows
+    finally:
+        # Pages that came back without stats count against the host
+        controller.release(token, "ok" if any(row[3] != "-" for row in rows) else "error")
+
+def load_champion(page, item):
+    """Load a champion page and read it, or placeholder rows if it never renders"""
+    champion, href, ranks = item.champion, item.url, item.views
+    with profiler.phase("navigate", href):
+        page.get(href)
+    print("Visiting:", href)
+
+    # Wait for page to load (with retry logic)
+    try:
+        with profiler.phase("wait"):
+            WebDriverWait(page, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, BUILD_SELECTOR))
+            )
+    except TimeoutException:
+        print(f"⚠ Timeout after 10s for {href}. Retrying with longer wait...")
         try:
-            num = float(cleaned_item)
-            # if no decimal part, cast to int
-            if num.is_integer():
-                num = int(num)
-            arr[i]=num
-        except ValueError:
-            arr[i]=cleaned_item
-    
-    print("format done", arr)
-    return arr
-
-def main():
-    all_data = []
-
-    # Collect hrefs first
-    links = driver.find_elements(By.CSS_SELECTOR, "div.grid.bg-purple-400 a")
-    hrefs = [link.get_attribute("href") for link in links]
-
-    # Loop through each href
-    for href in hrefs:
-        champion = href.split("/")[-2]
-        for rank in RANKS:
-            url = href + f"?rank={rank}"
-            driver.get(url)           
-            print("Visiting:", url)
-
-            # Wait for page to load (with retry logic)
-            try:
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.champion-recommended-build"))
+            with profiler.phase("wait"):
+                WebDriverWait(page, 30).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, BUILD_SELECTOR))
                 )
-            except TimeoutException:
-                print(f"⚠ Timeout after 10s for {url}. Retrying with longer wait...")
+        except TimeoutException:
+            print(f"❌ Skipping {href} — element not found even after retry.")
+            return [[champion, rank] + ["-"] * 6 for rank in ranks]
+
+    return read_champion(page, item)
+
+def read_champion(page, item):
+    """Read the stats for every planned rank from a loaded champion page"""
+    champion, href, ranks = item.champion, item.url, item.views
+    with profiler.phase("extract", href):
+        page.set_script_timeout(30)
+        payload = page.execute_async_script(RANKINGS_PAYLOAD_JS)
+        page_source = page.page_source
+    if looks_blocked(page_source):
+        print(f"🚧 Challenge page served for {href}")
+    with profiler.phase("parse"):
+        stats_col_text = parse_ugg_stats(page_source)
+    state = {
+        "payload": payload,
+        "tier": stats_col_text[0] if stats_col_text else "-",
+    }
+    if payload is None:
+        print(f"⚠ No stats payload found for {href}")
+    elif store:
+        with profiler.phase("write"):
+            store.save(href, state=state)
+
+    with profiler.phase("parse"):
+        rows = champion_rows(champion, state, ranks)
+    if all(row[3] == "-" for row in rows):
+        # Either no payload or one whose layout parsers.py no longer matches
+        raise ValueError(f"no stats for any rank of {champion} in the page's payload")
+    return rows
+
+def scrape_in_workers(items):
+    """Scrape champions concurrently, one browser per worker; yields (item, champion_data, error)"""
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            futures = {pool.submit(scrape_champion, item): item for item in items}
+            for future in as_completed(futures):
                 try:
-                    WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.champion-recommended-build"))
-                    )
-                except TimeoutException:
-                    print(f"❌ Skipping {url} — element not found even after retry.")
-                    all_data.append([champion, rank] + ["-"] * 6)   
-                    continue  # skip to next URL
-            
-            stats_container = driver.find_element(
-                By.CSS_SELECTOR,
-                "div.grid.grid-flow-col.bg-purple-500"
-            )
-
-            stats_col = stats_container.find_elements(By.CSS_SELECTOR, "div.font-extrabold")
-            stats_col_text = [el.text for el in stats_col]
-            stats_cleaned = format(stats_col_text)
+                    _, champion_data = future.result()
+                except Exception as e:
+                    yield futures[future], None, e
+                    continue
+                yield futures[future], champion_data, None
+    finally:
+        for worker in workers:
+            quit_driver(worker)
+
+def load_stored_champion(item):
+    """Rows of a champion from a stored page, or None"""
+    snapshot = store.load(item.url) if store else None
+    if snapshot and snapshot.state:
+        print("Using stored snapshot:", item.url)
+        return champion_rows(item.champion, snapshot.state, item.views)
+    return None
+
+def read_champion_tab(page, item):
+    print("Visited:", item.url)
+    return read_champion(page, item)
+
+def scrape_in_tabs(items):
+    """Scrape champions as tabs of one browser; yields (item, champion_data, error)"""
+    return scrape_tabs(items, load_stored_champion, BUILD_SELECTOR, read_champion_tab)
+
+# Rank is the player rank bracket, Role Rank the champion's place in its role ("12 / 60")
+COLUMNS = ['Champion', 'Rank', 'Tier', 'Win Rate', 'Role Rank', 'Pick Rate', 'Ban Rate', 'Matches']
 
-            stats_cleaned = [champion, rank] + stats_cleaned
-            all_data.append(stats_cleaned)         
-
-        driver.back()              # Go back to the grid page
-
-    df = pd.DataFrame(all_data, columns=['Champion', 'Rank', 'Tier', 'Win Rate', 'Rank', 'Pick Rate', 'Ban Rate', 'Matches'])
-    print(df.head)
-
-    df.to_csv("champions.csv", index=False)
-
-main()
-
-driver.quit()
\ No newline at end of file
+def main():
+    items, run_id = ([], None) if REPARSE else load_plan(SOURCE)
+    output = CsvCheckpoint("champions.csv", COLUMNS, run_id=run_id, dtypes=UGG)
+
+    if REPARSE:
+        reparse(output)
+        return
+
+    # Champions fetched recently on this patch are reused from the ledger
+    ledger = RefreshLedger()
+    to_fetch, fresh = schedule(ledger, SOURCE, items)
+    for item, champion_data in fresh:
+        if not output.is_done(item.url):
+            output.write(item.url, champion_data)
+    to_fetch = [item for item in to_fetch if not output.is_done(item.url)]
+
+    # Most urgent first, writing each champion to disk as it finishes
+    results = scrape_in_tabs(to_fetch) if TABS else scrape_in_workers(to_fetch)
+    for item, champion_data, error in results:
+        if error:
+            print(f"❌ Failed {item.champion}: {error}")
+            continue
+        if all(row[3] == "-" for row in champion_data):
+            # A page that never rendered stats stays out of the manifest and is retried next run
+            print(f"❌ No stats for {item.champion}, will retry next run")
+            continue
+        ledger.record(SOURCE, item_cell(item), item.patch, champion_data)
+        with profiler.phase("write", item.url):
+            output.write(item.url, champion_data)
+
+    output.complete()
+    print(f"✅ Saved {len(output.done)} champions to champions.csv")
+
+if __name__ == "__main__":
+    main()
@@ -1,107 +1,135 @@
 """
-Scraper to get "strong against" and "weak against" champions by clicking the filter buttons
+Scraper to get the winrate by ranked games played curve (graphDD13) from leagueofgraphs.
+
+The plot data is inline in the served HTML, so pages are fetched over plain
+HTTP with a pooled, adaptively paced thread pool instead of a browser.
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-import pandas as pd
-import time
-import re
-
-# Setup Chrome options
-options = Options()
-options.add_argument("--headless")
-options.add_argument("--disable-blink-features=AutomationControlled")
-options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-driver = webdriver.Chrome(options=options)
+from champions import CHAMPIONS
+from checkpoint import CsvCheckpoint
+from curves import CurveStore
+from fetcher import fetch_all
+from parsers import parse_winrate_curve
+from profiling import profiler
+from refresh import RefreshLedger
+from schema import WINRATE_CURVES
+from snapshots import REPARSE, store_from_env
+from sweep import SOURCES, item_cell, load_plan, schedule
+
+# Optional page snapshots (SNAPSHOT_DIR); --reparse works from them without fetching
+store = store_from_env()
+
+# Politeness: at most this many requests in flight; the host's controller
+# adapts the actual concurrency and spacing (HOST_CAPS)
+WORKERS = 8
 
 # Complete champions list
-champions = [
-    "aatrox", "ahri", "akali", "akshan", "alistar", "ambessa", "amumu", "anivia", 
-    "annie", "aphelios", "ashe", "aurelionsol", "aurora", "azir", "bard", "belveth",
-    "blitzcrank", "brand", "braum", "briar", "caitlyn", "camille", "cassiopeia", 
-    "chogath", "corki", "darius", "diana", "drmundo", "draven", "ekko", "elise",
-    "evelynn", "ezreal", "fiddlesticks", "fiora", "fizz", "galio", "gangplank",
-    "garen", "gnar", "gragas", "graves", "gwen", "hecarim", "heimerdinger", "hwei",
-    "illaoi", "irelia", "ivern", "janna", "jarvaniv", "jax", "jayce", "jhin", "jinx",
-    "ksante", "kaisa", "kalista", "karma", "karthus", "kassadin", "katarina", "kayle",
-    "kayn", "kennen", "khazix", "kindred", "kled", "kogmaw", "leblanc", "leesin",
-    "leona", "lillia", "lissandra", "lucian", "lulu", "lux", "malphite", "malzahar",
-    "maokai", "masteryi", "mel", "milio", "missfortune", "mordekaiser", "morgana",
-    "naafiri", "nami", "nasus", "nautilus", "neeko", "nidalee", "nilah", "nocturne",
-    "nunu", "olaf", "orianna", "ornn", "pantheon", "poppy", "pyke", "qiyana", "quinn",
-    "rakan", "rammus", "reksai", "rell", "renata", "renekton", "rengar", "riven",
-    "rumble", "ryze", "samira", "sejuani", "senna", "seraphine", "sett", "shaco",
-    "shen", "shyvana", "singed", "sion", "sivir", "skarner", "smolder", "sona",
-    "soraka", "swain", "sylas", "syndra", "tahmkench", "taliyah", "talon", "taric",
-    "teemo", "thresh", "tristana", "trundle", "tryndamere", "twistedfate", "twitch",
-    "udyr", "urgot", "varus", "vayne", "veigar", "velkoz", "vex", "vi", "viego",
-    "viktor", "vladimir", "volibear", "warwick", "wukong", "xayah", "xerath",
-    "xinzhao", "yasuo", "yone", "yorick", "yunara", "yuumi", "zac", "zed", "zeri",
-    "ziggs", "zilean", "zoe", "zyra"
-]
+champions = CHAMPIONS
 
 roles = ["top", "jungle", "middle", "adc", "support"]
 
-# Store all results
-all_data = []
-
-# Loop through each champion and role
-for champion in champions:
-    for role in roles:
-        url = f"https://www.leagueofgraphs.com/champions/stats/{champion}/sg/{role}/diamond/sr-ranked"
-        print(f"Scraping {champion} - {role}...")
-
-        try:
-            driver.get(url)
-            time.sleep(2)  # Wait for page to load
-
-            # Get page source
-            page_source = driver.page_source
-
-            # Find the script tag with graphDD13 data using regex
-            pattern = r'\$\.plot\(\$\("#graphDD13"\),\s*\[\{[^}]*data:\s*(\[\[.*?\]\])'
-            match = re.search(pattern, page_source, re.DOTALL)
-
-            if match:
-                data_str = match.group(1)
-
-                # Check if data is [[0,100]] which means no real data
-                if data_str.strip() == "[[0,100]]":
-                    print(f"  No data found for {champion} - {role}")
-                    all_data.append({
-                        'champion': champion,
-                        'role': role,
-                        'data': "No data found"
-                    })
-                else:
-                    print(f"  Found data: {data_str}")
-                    # Store the result
-                    all_data.append({
-                        'champion': champion,
-                        'role': role,
-                        'data': data_str
-                    })
+SOURCE = "leagueofgraphs"
+BASE_URL = "https://www.leagueofgraphs.com/champions/stats/"
+
+def extract(champion, role, tier, region, page_source):
+    """Extract the graphDD13 data from a page into output rows"""
+    with profiler.phase("parse"):
+        data_str = parse_winrate_curve(page_source)
+    if data_str is None:
+        print(f"  No data found for {champion} - {role}")
+        data_str = "No data found"
+    else:
+        print(f"  Found data: {data_str}")
+
+    return [{
+        'champion': champion,
+        'role': role,
+        'data': data_str,
+        'tier': tier,
+        'region': region,
+    }]
+
+curve_stores = {}
+
+def curve_store(tier, region):
+    """Numeric curves for one tier and region: champion x role x bucket float32 array with a missing mask"""
+    if (tier, region) not in curve_stores:
+        default = (SOURCES[SOURCE].tiers[0], SOURCES[SOURCE].regions[0])
+        prefix = 'winrate_rankgames' if (tier, region) == default else f'winrate_rankgames_{tier}_{region}'
+        curve_stores[tier, region] = CurveStore(prefix, champions, roles)
+    return curve_stores[tier, region]
+
+def record(output, url, rows):
+    """Append a page's result to the CSV and the curve store"""
+    row = rows[0]
+    data_str = row['data']
+
+    # Parsed numeric curve goes to the memory-mapped store before the unit is marked done
+    curves = curve_store(row['tier'], row['region'])
+    curves.set(row['champion'], row['role'], None if data_str == "No data found" else data_str)
+    curves.flush()
+
+    # Store the result
+    with profiler.phase("write", url):
+        output.write(url, rows)
+
+def main():
+    # The site always serves the live patch; a new patch starts a new sweep
+    items, run_id = ([], None) if REPARSE else load_plan(SOURCE)
+    ledger = RefreshLedger()
+
+    # Results are appended per champion x role page so a crash only loses the current page
+    output = CsvCheckpoint('winrate_rankgames_data.csv', ['champion', 'role', 'data', 'tier', 'region'], run_id=run_id, dtypes=WINRATE_CURVES)
+
+    if REPARSE:
+        # Re-run the extractor over every stored page without fetching
+        output.reset()
+        for snapshot in store.matching(BASE_URL):
+            champion, region, role, tier = snapshot.url[len(BASE_URL):].split("/")[:4]
+            if (tier, region) not in curve_stores:
+                curve_store(tier, region).reset()
+            print(f"Re-parsing {champion} - {role}...")
+            record(output, snapshot.url, extract(champion, role, tier, region, snapshot.html))
+
+    else:
+        to_fetch, fresh = schedule(ledger, SOURCE, items)
+
+        # Pages fetched recently on this patch are reused from the ledger
+        for item, rows in fresh:
+            if not output.is_done(item.url):
+                record(output, item.url, rows)
+
+        # Stale or new pages, most urgent first, served from fresh snapshots where possible
+        jobs = []
+        for item in to_fetch:
+            if output.is_done(item.url):
+                continue
+
+            snapshot = store.load(item.url) if store else None
+            if snapshot:
+                print(f"Using stored snapshot for {item.champion} - {item.role}...")
+                rows = extract(item.champion, item.role, item.tier, item.region, snapshot.html)
+                ledger.record(SOURCE, item_cell(item), item.patch, rows)
+                record(output, item.url, rows)
             else:
-                print(f"  No data found for {champion} - {role}")
-                all_data.append({
-                    'champion': champion,
-                    'role': role,
-                    'data': "No data found"
-                })
-
-        except Exception as e:
-            print(f"  Error scraping {champion} - {role}: {str(e)}")
-            continue
-
-# Close driver
-driver.quit()
-
-# Convert to DataFrame and save
-df = pd.DataFrame(all_data)
-df.to_csv('winrate_rankgames_data.csv', index=False)
-print(f"\nScraping complete! Saved {len(all_data)} records to winrate_rankgames_data.csv")
\ No newline at end of file
+                jobs.append((item, item.url))
+
+        print(f"Fetching {len(jobs)} pages with up to {WORKERS} workers...")
+        for item, url, page_source, error in fetch_all(jobs, WORKERS):
+            if error:
+                print(f"  Error scraping {item.champion} - {item.role}: {str(error)}")
+                continue
+
+            print(f"Scraped {item.champion} - {item.role}")
+            if store:
+                store.save(url, page_source)
+            rows = extract(item.champion, item.role, item.tier, item.region, page_source)
+            ledger.record(SOURCE, item_cell(item), item.patch, rows)
+            record(output, url, rows)
+
+        output.complete()
+
+    print(f"\nScraping complete! Saved {len(output.done)} records to winrate_rankgames_data.csv")
+
+if __name__ == "__main__":
+    main()
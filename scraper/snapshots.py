@@ -0,0 +1,82 @@
+"""
+Optional compressed snapshot store for rendered pages.
+
+Each snapshot is one gzip'd JSON file keyed by URL (plus an optional view,
+e.g. which filter button was active) holding the rendered HTML and/or
+extracted state with its fetch time. Live runs reuse snapshots younger than
+the TTL instead of reloading the page, and `--reparse` runs the extractors
+over every stored snapshot without starting a browser.
+
+Enable by setting SNAPSHOT_DIR (and optionally SNAPSHOT_TTL_HOURS).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+Snapshot = namedtuple("Snapshot", ["url", "view", "fetched_at", "html", "state"])
+
+DEFAULT_TTL_HOURS = 24
+
+# Offline mode: run the extractors over stored snapshots only
+REPARSE = "--reparse" in sys.argv
+
+class SnapshotStore:
+    def __init__(self, root, ttl=DEFAULT_TTL_HOURS * 3600):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _path(self, url, view=None):
+        key = url if view is None else f"{url}#{view}"
+        return self.root / f"{hashlib.sha1(key.encode()).hexdigest()}.json.gz"
+
+    def save(self, url, html=None, state=None, view=None):
+        """Store the rendered page and/or extracted state for a URL"""
+        record = {"url": url, "view": view, "fetched_at": time.time(), "html": html, "state": state}
+        path = self._path(url, view)
+        tmp = path.with_suffix(".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+    def load(self, url, view=None, max_age=None):
+        """Return a snapshot no older than max_age (defaults to the TTL), or None"""
+        path = self._path(url, view)
+        if not path.exists():
+            return None
+        snapshot = self._read(path)
+        max_age = self.ttl if max_age is None else max_age
+        if time.time() - snapshot.fetched_at > max_age:
+            return None
+        return snapshot
+
+    def _read(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return Snapshot(**json.load(f))
+
+    def __iter__(self):
+        """Iterate over every stored snapshot regardless of age"""
+        for path in sorted(self.root.glob("*.json.gz")):
+            yield self._read(path)
+
+    def matching(self, url_prefix, view=None):
+        """Stored snapshots whose URL starts with the prefix, ignoring age"""
+        for snapshot in self:
+            if snapshot.url.startswith(url_prefix) and (view is None or snapshot.view == view):
+                yield snapshot
+
+def store_from_env():
+    """Open the store configured by SNAPSHOT_DIR, or None when snapshots are off"""
+    root = os.getenv("SNAPSHOT_DIR")
+    if not root:
+        if REPARSE:
+            sys.exit("--reparse needs SNAPSHOT_DIR to point at a snapshot store")
+        return None
+    ttl_hours = float(os.getenv("SNAPSHOT_TTL_HOURS", DEFAULT_TTL_HOURS))
+    return SnapshotStore(root, ttl=ttl_hours * 3600)
@@ -0,0 +1,259 @@
+"""
+Parameter-matrix sweep planner for the scrapers.
+
+Expands champions x roles x tiers x regions x patches for each source into
+work items, one per distinct URL. Dimensions a source's URL does not use
+collapse away (leagueofgraphs has no patch, one U.GG page has every rank),
+and sources that load the same page (lolalytics counters and synergy share
+the build page) are merged into one item carrying every view they need. The
+first source to load a page captures all of its views into the snapshot
+store, so the later ones are served without reloading it.
+
+    python scraper/sweep.py --sources lolalytics_counters lolalytics_synergy \\
+        --tiers diamond_plus emerald_plus --patches current 15.18
+
+Tier, role and region names are each site's own (lolalytics "diamond_plus",
+leagueofgraphs "diamondplus", U.GG ranks "diamond") and are checked against
+what each selected source accepts, so a sweep overriding them covers sources
+that share the names. Without a sweep every scraper plans just its own
+default tier/region/patch.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from collections import namedtuple
+from itertools import product
+from pathlib import Path
+
+from champions import CHAMPIONS
+from refresh import ANY, Cell, current_patch
+
+WorkItem = namedtuple("WorkItem", ["source", "url", "champion", "role", "tier", "region", "patch", "views"])
+
+Source = namedtuple("Source", ["script", "url", "dims", "views", "roles", "tiers", "regions", "accepts"])
+
+LANES = ["top", "jungle", "middle", "bottom", "support"]
+
+# Values each site understands for the dimensions its URL uses
+LOLALYTICS_TIERS = [
+    "all", "1trick", "challenger", "grandmaster_plus", "grandmaster", "master_plus", "master",
+    "diamond_plus", "diamond", "emerald_plus", "emerald", "platinum_plus", "platinum",
+    "gold_plus", "gold", "silver", "bronze", "iron",
+]
+LOLALYTICS_REGIONS = [
+    "all", "na", "euw", "eune", "kr", "br", "lan", "las", "oce", "ru", "tr", "jp",
+    "ph", "sg", "th", "tw", "vn", "me",
+]
+LEAGUEOFGRAPHS_TIERS = [
+    "iron", "bronze", "silver", "gold", "platinum", "emerald", "diamond", "master", "grandmaster",
+    "challenger", "platinumplus", "emeraldplus", "diamondplus", "masterplus",
+]
+LEAGUEOFGRAPHS_REGIONS = [region for region in LOLALYTICS_REGIONS if region != "all"]
+LEAGUEOFGRAPHS_ROLES = ["top", "jungle", "middle", "adc", "support"]
+UGG_RANKS = ["overall", "iron", "bronze", "silver", "gold", "platinum", "emerald",
+             "diamond", "master", "grandmaster", "challenger"]
+
+# In run order: sources sharing pages are adjacent so the page is still warm
+SOURCES = {
+    "lolalytics_counters": Source(
+        script="scraplolalytics.py",
+        url="https://lolalytics.com/lol/{champion}/build/?tier={tier}&patch={patch}",
+        dims=("champion", "tier", "patch"),
+        views=["strong_against", "weak_against"],
+        roles=[ANY], tiers=["diamond_plus"], regions=[ANY],
+        accepts={"tier": LOLALYTICS_TIERS},
+    ),
+    "lolalytics_synergy": Source(
+        script="lolanalytics-synergy.py",
+        url="https://lolalytics.com/lol/{champion}/build/?tier={tier}&patch={patch}",
+        dims=("champion", "tier", "patch"),
+        views=["good_synergy"],
+        roles=[ANY], tiers=["diamond_plus"], regions=[ANY],
+        accepts={"tier": LOLALYTICS_TIERS},
+    ),
+    "lolalytics_tierlist": Source(
+        script="lolalytics-winrate.py",
+        url="https://lolalytics.com/lol/tierlist/?lane={role}&tier={tier}&region={region}&patch={patch}",
+        dims=("role", "tier", "region", "patch"),
+        views=[],
+        roles=LANES, tiers=["diamond"], regions=["sg"],
+        accepts={"role": LANES, "tier": LOLALYTICS_TIERS, "region": LOLALYTICS_REGIONS},
+    ),
+    "leagueofgraphs": Source(
+        script="scraperwinrate-rankgame.py",
+        url="https://www.leagueofgraphs.com/champions/stats/{champion}/{region}/{role}/{tier}/sr-ranked",
+        dims=("champion", "role", "tier", "region"),
+        views=[],
+        roles=LEAGUEOFGRAPHS_ROLES, tiers=["diamond"], regions=["sg"],
+        accepts={"role": LEAGUEOFGRAPHS_ROLES, "tier": LEAGUEOFGRAPHS_TIERS, "region": LEAGUEOFGRAPHS_REGIONS},
+    ),
+    "ugg": Source(
+        script="scraper.py",
+        url="https://u.gg/lol/champions/{champion}/build",
+        dims=("champion",),
+        views=None,  # one page has every rank: the tiers are its views
+        roles=[ANY], tiers=UGG_RANKS, regions=[ANY],
+        accepts={"tier": UGG_RANKS},
+    ),
+}
+
+# SITE_OVERRIDE=http://127.0.0.1:8765 sends every planned page to a local
+# fixture server (scraper/fixtures.py) instead, keeping the site's host as the
+# first path segment: https://u.gg/lol/... -> http://127.0.0.1:8765/u.gg/lol/...
+def site_url(url):
+    override = os.getenv("SITE_OVERRIDE")
+    if not override:
+        return url
+    return override.rstrip("/") + "/" + url.split("://", 1)[1]
+
+def resolve_patches(patches):
+    current = None
+    resolved = []
+    for patch in patches:
+        if patch == "current":
+            current = current or current_patch()
+            patch = current
+        if patch not in resolved:
+            resolved.append(patch)
+    return resolved
+
+def check_overrides(name, spec, overrides):
+    """Reject role/tier/region values a source's site does not understand"""
+    for dim, values in overrides.items():
+        if not values or dim not in spec.accepts:
+            continue
+        unknown = [value for value in values if value not in spec.accepts[dim]]
+        if unknown:
+            raise ValueError(f"{name} does not support {dim} {', '.join(unknown)} "
+                             f"(choose from {', '.join(spec.accepts[dim])})")
+
+def plan(sources, champions=None, roles=None, tiers=None, regions=None, patches=None):
+    """
+    Expand the parameter matrix for each source into deduplicated work items,
+    ordered so that items loading the same page are adjacent. Raises
+    ValueError for a role, tier or region a selected source does not support.
+    """
+    patches = resolve_patches(patches or ["current"])
+    by_url = {}
+    for name in sources:
+        spec = SOURCES[name]
+        check_overrides(name, spec, {"role": roles, "tier": tiers, "region": regions})
+        axes = {
+            "champion": champions or CHAMPIONS,
+            "role": roles or spec.roles,
+            "tier": tiers or spec.tiers,
+            "region": regions or spec.regions,
+            "patch": patches,
+        }
+        # Dimensions not in the URL collapse to a single value
+        for dim in axes:
+            if dim not in spec.dims and not (dim == "tier" and spec.views is None):
+                axes[dim] = [ANY if dim != "patch" else patches[0]]
+
+        for champion, role, tier, region, patch in product(*axes.values()):
+            views = [tier] if spec.views is None else spec.views
+            url = site_url(spec.url.format(champion=champion, role=role, tier=tier, region=region, patch=patch))
+            key = (name, url)
+            if key in by_url:
+                by_url[key]["views"] += [v for v in views if v not in by_url[key]["views"]]
+                continue
+            by_url[key] = {
+                "source": name, "url": url, "champion": champion, "role": role,
+                "tier": ANY if spec.views is None else tier, "region": region,
+                "patch": patch, "views": list(views),
+            }
+
+    # Every source sharing a URL captures the views of all of them
+    shared = {}
+    for item in by_url.values():
+        views = shared.setdefault(item["url"], [])
+        for view in item["views"]:
+            if view not in views:
+                views.append(view)
+    items = [WorkItem(**{**item, "views": shared[item["url"]]}) for item in by_url.values()]
+
+    # Group by page, keeping the source run order within a page
+    order = list(SOURCES)
+    items.sort(key=lambda i: (order.index(i.source), i.patch, i.tier, i.region, i.champion, i.role))
+    return items
+
+def plan_id(items):
+    keys = sorted(f"{i.url} {i.patch}" for i in items)
+    return hashlib.sha1("\n".join(keys).encode()).hexdigest()[:12]
+
+def item_cell(item):
+    """Refresh ledger cell for a work item"""
+    return Cell(item.champion, item.role, item.tier, item.region)
+
+def load_plan(source):
+    """
+    Work items for one source: from the running sweep (SWEEP_PLAN), or the
+    source's own defaults for the current patch. Returns (items, run_id).
+    """
+    plan_file = os.getenv("SWEEP_PLAN")
+    if plan_file:
+        data = json.loads(Path(plan_file).read_text())
+        items = [WorkItem(**item) for item in data["items"] if item["source"] == source]
+        return items, data["id"]
+    items = plan([source])
+    return items, plan_id(items)
+
+def schedule(ledger, source, items):
+    """
+    Ask the refresh ledger which items need fetching. Returns (to_fetch, fresh)
+    where fresh is a list of (item, rows) reusable as is.
+    """
+    to_fetch, fresh = [], []
+    by_patch = {}
+    for item in items:
+        by_patch.setdefault(item.patch, []).append(item)
+    for patch, group in by_patch.items():
+        cells = {item_cell(i): i for i in group}
+        fetch_cells, fresh_cells = ledger.plan(source, list(cells), patch)
+        to_fetch += [cells[cell] for cell in fetch_cells]
+        fresh += [(cells[cell], rows) for cell, rows in fresh_cells]
+    return to_fetch, fresh
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan and run a multi-tier/region/patch scrape")
+    parser.add_argument("--sources", nargs="+", default=list(SOURCES), choices=list(SOURCES))
+    parser.add_argument("--champions", nargs="+")
+    parser.add_argument("--roles", nargs="+")
+    parser.add_argument("--tiers", nargs="+")
+    parser.add_argument("--regions", nargs="+")
+    parser.add_argument("--patches", nargs="+", default=["current"])
+    parser.add_argument("--plan-file", default="sweep_plan.json")
+    parser.add_argument("--dry-run", action="store_true", help="only write and summarise the plan")
+    args = parser.parse_args()
+
+    sources = [name for name in SOURCES if name in args.sources]
+    try:
+        items = plan(sources, args.champions, args.roles, args.tiers, args.regions, args.patches)
+    except ValueError as e:
+        parser.error(str(e))
+    Path(args.plan_file).write_text(json.dumps({
+        "id": plan_id(items),
+        "items": [item._asdict() for item in items],
+    }, indent=1))
+
+    pages = len({item.url for item in items})
+    print(f"🗺 Planned {len(items)} work items over {pages} distinct pages -> {args.plan_file}")
+    for name in sources:
+        print(f"   {name}: {sum(i.source == name for i in items)} items")
+    if args.dry_run:
+        return
+
+    # Shared pages are reused through the snapshot store
+    env = {**os.environ, "SWEEP_PLAN": str(Path(args.plan_file).resolve())}
+    env.setdefault("SNAPSHOT_DIR", "snapshots")
+    here = Path(__file__).resolve().parent
+    for name in sources:
+        print(f"\n🚀 Running {name}")
+        subprocess.run([sys.executable, str(here / SOURCES[name].script)], env=env, check=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The scripts import their sibling modules by bare name
+ROOT = Path(__file__).resolve().parent.parent
+for folder in ("scraper", "api"):
+    sys.path.insert(0, str(ROOT / folder))
@@ -0,0 +1,61 @@
+"""Resuming, truncating and resetting the crash-safe CSV output"""
+
+import pandas as pd
+
+from checkpoint import CsvCheckpoint
+
+COLUMNS = ["champion", "role", "win_rate"]
+
+def two_units(path, run_id="15.19"):
+    output = CsvCheckpoint(path, COLUMNS, run_id=run_id)
+    output.write("ahri", [["ahri", "middle", 52.1], ["ahri", "top", 48.0]])
+    output.write("zed", [["zed", "middle", 50.5]])
+    return output
+
+def crash_mid_unit(path):
+    """Rows of a third unit reach the CSV, then the run dies before the manifest does"""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("yasuo,middle,49.")
+
+def test_resume_truncates_rows_after_the_last_unit(tmp_path):
+    path = tmp_path / "out.csv"
+    two_units(path)
+    written = path.read_bytes()
+    crash_mid_unit(path)
+
+    resumed = CsvCheckpoint(path, COLUMNS, run_id="15.19")
+
+    assert path.read_bytes() == written
+    assert resumed.done == {"ahri", "zed"}
+    assert resumed.is_done("zed") and not resumed.is_done("yasuo")
+    resumed.write("yasuo", [["yasuo", "middle", 49.9]])
+    assert pd.read_csv(path)["champion"].tolist() == ["ahri", "ahri", "zed", "yasuo"]
+
+def test_crash_before_the_first_unit_deletes_the_file(tmp_path):
+    path = tmp_path / "out.csv"
+    output = CsvCheckpoint(path, COLUMNS, run_id="15.19")
+    output.write("ahri", [])  # a unit without rows records offset 0
+    crash_mid_unit(path)
+
+    resumed = CsvCheckpoint(path, COLUMNS, run_id="15.19")
+
+    assert not path.exists()
+    assert resumed.done == {"ahri"}
+
+def test_new_run_id_starts_over(tmp_path):
+    path = tmp_path / "out.csv"
+    two_units(path)
+
+    output = CsvCheckpoint(path, COLUMNS, run_id="15.20")
+
+    assert output.done == set()
+    assert not path.exists() and not output.manifest_file.exists()
+
+def test_completed_sweep_starts_a_new_file(tmp_path):
+    path = tmp_path / "out.csv"
+    two_units(path).complete()
+
+    output = CsvCheckpoint(path, COLUMNS, run_id="15.19")
+    assert output.done == set() and not path.exists()
+    output.write("ahri", [["ahri", "middle", 51.0]])
+    assert pd.read_csv(path).values.tolist() == [["ahri", "middle", 51.0]]
@@ -0,0 +1,102 @@
+"""The plain-HTTP path of the leagueofgraphs scraper against a saved stats page"""
+
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+import requests
+
+import politeness
+from curves import parse_curve
+from fetcher import fetch_all
+from parsers import parse_winrate_curve
+
+STATS_PAGE = Path(__file__).resolve().parent.parent / "scraper" / "example1.html"
+
+class SavedPages(BaseHTTPRequestHandler):
+    pages = {"/champions/stats/ahri/sg/middle/diamond/sr-ranked": STATS_PAGE.read_bytes()}
+
+    def do_GET(self):
+        if self.path.startswith("/throttled"):
+            # /throttled waits in seconds, /throttled-until until an HTTP date
+            retry_after = formatdate(time.time() + 7, usegmt=True) if self.path == "/throttled-until" else "7"
+            self.send_response(429)
+            self.send_header("Retry-After", retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.pages.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "text/html;charset=utf-8")
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+        self.wfile.write(body or b"")
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(autouse=True)
+def fresh_controllers(monkeypatch):
+    """Every test starts with new per-host politeness controllers"""
+    monkeypatch.setattr(politeness, "controllers", {})
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SavedPages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def test_fetch_and_parse_curve(site):
+    url = f"{site}/champions/stats/ahri/sg/middle/diamond/sr-ranked"
+    [(key, fetched_url, html, error)] = list(fetch_all([("ahri", url)], workers=2))
+
+    assert (key, fetched_url, error) == ("ahri", url, None)
+    data_str = parse_winrate_curve(html)
+    assert data_str == "[[0,52.05],[10,57.14],[20,44.440000000000005],[30,0],[40,33.33],[50,50]]"
+    np.testing.assert_allclose(parse_curve(data_str), [52.05, 57.14, 44.44, 0, 33.33, 50], rtol=1e-6)
+
+def test_missing_page_is_reported(site):
+    url = f"{site}/champions/stats/ahri/sg/top/diamond/sr-ranked"
+    [(key, _, html, error)] = list(fetch_all([("ahri", url)], workers=2))
+
+    assert key == "ahri" and html is None
+    assert isinstance(error, requests.HTTPError)
+
+def test_page_without_data():
+    html = STATS_PAGE.read_text(encoding="utf-8").replace(
+        "[[0,52.05],[10,57.14],[20,44.440000000000005],[30,0],[40,33.33],[50,50]]", "[[0,100]]")
+    assert parse_winrate_curve(html) is None
+    assert np.isnan(parse_curve(None)).all()
+
+@pytest.mark.parametrize("path", ["/throttled", "/throttled-until"])
+def test_throttling_reaches_the_controller(site, path):
+    url = f"{site}{path}"
+    started = time.monotonic()
+    [(_, _, html, error)] = list(fetch_all([("ahri", url)], workers=2))
+
+    # Not retried inside the session: the controller backs off and pauses the host
+    assert time.monotonic() - started < 1
+    assert html is None and error.response.status_code == 429
+    controller = politeness.controller_for(url)
+    assert controller.paused_until - time.monotonic() > 5
+    assert controller.interval > politeness.START_INTERVAL
+
+@pytest.mark.parametrize("value, seconds", [
+    ("7", 7.0),
+    ("0", 0.0),
+    (formatdate(time.time() - 60, usegmt=True), 0.0),
+    ("soon", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_retry_after(value, seconds):
+    assert politeness.parse_retry_after(value) == seconds
+
+def test_parse_retry_after_http_date():
+    assert 8 < politeness.parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
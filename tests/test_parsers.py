@@ -0,0 +1,60 @@
+"""The page and payload layouts parsers.py relies on"""
+
+from collections import Counter
+from pathlib import Path
+
+from parsers import UGG_RANK_IDS, UGG_WORLD, parse_matchups, parse_ugg_rankings
+from sweep import SOURCES
+
+# A saved lolalytics build page for aatrox, on its "strong against" view
+BUILD_PAGE = Path(__file__).resolve().parent.parent / "scraper" / "example.html"
+
+def stats(wins, matches, rank, total_rank, bans, total_matches):
+    """A rankings stats list in the layout parsers.py reads"""
+    return [wins, matches, rank, total_rank, 0, 0, 0, 0, 0, 0, bans, total_matches]
+
+# Shaped like stats2.u.gg's rankings JSON: region -> rank -> role -> stats
+PAYLOAD = {
+    UGG_WORLD: {
+        UGG_RANK_IDS["overall"]: {
+            "4": stats(26_150, 50_000, 12, 60, 30_000, 2_000_000),  # main role
+            "5": stats(4_900, 10_000, 40, 58, 30_000, 2_000_000),
+        },
+        UGG_RANK_IDS["diamond"]: {
+            "4": stats(1_030, 2_000, 3, 55, 1_200, 100_000),
+        },
+        UGG_RANK_IDS["iron"]: {
+            "4": [1, 2, 3],  # not the layout above
+        },
+    },
+    "1": {UGG_RANK_IDS["gold"]: {"4": stats(1, 2, 3, 4, 5, 6)}},  # another region
+}
+
+def test_main_role_stats():
+    assert parse_ugg_rankings(PAYLOAD, "overall") == {
+        "win_rate": 52.3, "rank": "12 / 60", "pick_rate": 2.5, "ban_rate": 1.5, "matches": 50_000,
+    }
+    assert parse_ugg_rankings(PAYLOAD, "diamond") == {
+        "win_rate": 51.5, "rank": "3 / 55", "pick_rate": 2.0, "ban_rate": 1.2, "matches": 2_000,
+    }
+
+def test_ranks_without_usable_stats():
+    assert parse_ugg_rankings(PAYLOAD, "gold") is None  # only in another region
+    assert parse_ugg_rankings(PAYLOAD, "iron") is None  # unknown layout
+    assert parse_ugg_rankings({}, "overall") is None
+
+def test_every_rank_has_an_id():
+    assert set(SOURCES["ugg"].tiers) == set(UGG_RANK_IDS)
+    assert len(set(UGG_RANK_IDS.values())) == len(UGG_RANK_IDS)
+
+def test_build_page_matchup_cards():
+    matchups = parse_matchups(BUILD_PAGE.read_text(encoding="utf-8"), "aatrox", "counter_type", "strong_against")
+
+    assert len(matchups) == 94
+    assert matchups[0] == {
+        "champion": "aatrox", "role": "top", "counter_type": "strong_against", "opponent": "kled",
+        "win_rate": "0.00", "delta_1": "-48.50", "delta_2": "-51.94", "pick_rate": "0.67", "games": "3",
+    }
+    # Every lane's card row is found; the champion's own card is not a matchup
+    assert Counter(m["role"] for m in matchups) == {"top": 18, "jungle": 19, "middle": 19, "bottom": 19, "support": 19}
+    assert all(m["opponent"] != "aatrox" for m in matchups)
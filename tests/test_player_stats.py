@@ -0,0 +1,55 @@
+"""Conversion of name-keyed player aggregates to champion codes"""
+
+import sqlite3
+
+import pytest
+
+from player_stats import SCHEMA_VERSION, PlayerStats
+
+# The layout before champion codes: champion held the champion name
+OLD_SCHEMA = """
+    CREATE TABLE aggregates (
+        puuid TEXT, champion TEXT, position TEXT, patch TEXT,
+        games INTEGER, wins INTEGER, duration INTEGER,
+        kills INTEGER, deaths INTEGER, assists INTEGER, last_played INTEGER,
+        PRIMARY KEY (puuid, champion, position, patch)
+    );
+    CREATE TABLE counted (match_id TEXT, puuid TEXT, PRIMARY KEY (match_id, puuid));
+"""
+
+def old_database(path, rows):
+    db = sqlite3.connect(path)
+    db.executescript(OLD_SCHEMA)
+    db.executemany("INSERT INTO aggregates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    db.execute("INSERT INTO counted VALUES ('EUW1_1', 'p1')")
+    db.commit()
+    db.close()
+
+def test_name_keyed_rows_become_codes(tmp_path):
+    path = tmp_path / "stats.sqlite"
+    old_database(path, [
+        ("p1", "Ahri", "MIDDLE", "15.19", 3, 2, 5400, 20, 6, 15, 1000),
+        # Already a code, e.g. added after the switch: merges with the row above
+        ("p1", "103", "MIDDLE", "15.19", 1, 1, 1800, 8, 1, 4, 2000),
+        ("p1", "Zed", "MIDDLE", "15.19", 1, 0, 1500, 2, 7, 1, 1500),
+    ])
+
+    stats = PlayerStats(path)
+
+    assert stats.db.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    df = stats.get("p1").set_index("champion")
+    assert sorted(df.index) == [103, 238]
+    assert df.loc[103, ["games", "wins", "kills", "last_played"]].tolist() == [4, 3, 28, 2000]
+    # Counted matches survive, so they are not added twice
+    assert not stats.add_match("EUW1_1", {}, {"puuid": "p1", "championId": 103})
+
+def test_unknown_champion_leaves_the_database_alone(tmp_path):
+    path = tmp_path / "stats.sqlite"
+    old_database(path, [("p1", "NotAChampion", "TOP", "15.19", 1, 1, 1800, 1, 1, 1, 1000)])
+
+    with pytest.raises(SystemExit):
+        PlayerStats(path)
+
+    db = sqlite3.connect(path)
+    assert db.execute("PRAGMA user_version").fetchone()[0] == 0
+    assert db.execute("SELECT champion FROM aggregates").fetchall() == [("NotAChampion",)]
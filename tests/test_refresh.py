@@ -0,0 +1,86 @@
+"""Fresh/stale planning, backoff and urgency of the refresh ledger"""
+
+import pytest
+
+import refresh
+from refresh import MAX_BACKOFF, Cell, RefreshLedger
+
+HOUR = 3600
+SOURCE = "ugg"
+
+def cell(champion):
+    return Cell(champion, "middle", "emerald_plus", "world")
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(refresh.time, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def ledger(tmp_path):
+    return RefreshLedger(tmp_path / "ledger.sqlite", max_age_hours=24)
+
+def test_recent_cells_are_fresh_and_old_or_new_ones_stale(ledger, clock):
+    ledger.record(SOURCE, cell("ahri"), "15.19", [["ahri", 52.1]])
+    ledger.record(SOURCE, cell("zed"), "15.19", [["zed", 50.5]])
+
+    clock[0] += 23 * HOUR
+    to_fetch, fresh = ledger.plan(SOURCE, [cell("ahri"), cell("zed"), cell("yasuo")], "15.19")
+    assert to_fetch == [cell("yasuo")]
+    assert fresh == [(cell("ahri"), [["ahri", 52.1]]), (cell("zed"), [["zed", 50.5]])]
+
+    clock[0] += 2 * HOUR
+    to_fetch, fresh = ledger.plan(SOURCE, [cell("ahri"), cell("zed")], "15.19")
+    assert set(to_fetch) == {cell("ahri"), cell("zed")} and fresh == []
+
+def test_cells_of_another_patch_are_stale(ledger, clock):
+    ledger.record(SOURCE, cell("ahri"), "15.19", [["ahri", 52.1]])
+    to_fetch, fresh = ledger.plan(SOURCE, [cell("ahri")], "15.20")
+    assert to_fetch == [cell("ahri")] and fresh == []
+
+@pytest.mark.parametrize("unchanged", [0, 1, 2, MAX_BACKOFF, MAX_BACKOFF + 2])
+def test_unchanged_content_backs_off(ledger, clock, unchanged):
+    for i in range(unchanged + 1):
+        # Only the first fetch is a change
+        assert ledger.record(SOURCE, cell("ahri"), "15.19", [["ahri", 52.1]]) == (i == 0)
+    max_age = 24 * HOUR * 2 ** min(unchanged, MAX_BACKOFF)
+
+    clock[0] += max_age - 1
+    assert ledger.plan(SOURCE, [cell("ahri")], "15.19")[0] == []
+    clock[0] += 2
+    assert ledger.plan(SOURCE, [cell("ahri")], "15.19")[0] == [cell("ahri")]
+
+def test_changed_content_resets_the_backoff(ledger, clock):
+    for _ in range(3):
+        ledger.record(SOURCE, cell("ahri"), "15.19", [["ahri", 52.1]])
+    assert ledger.record(SOURCE, cell("ahri"), "15.19", [["ahri", 53.0]])
+
+    clock[0] += 25 * HOUR
+    assert ledger.plan(SOURCE, [cell("ahri")], "15.19")[0] == [cell("ahri")]
+
+def test_urgency_is_priority_then_history_then_age(ledger, clock):
+    # Changed on the previous patch: more volatile than the others
+    ledger.record(SOURCE, cell("volatile"), "15.18", [["volatile", 50.0]])
+    ledger.record(SOURCE, cell("volatile"), "15.18", [["volatile", 51.0]])
+    ledger.record(SOURCE, cell("old"), "15.19", [["old", 50.0]])
+    clock[0] += 10 * HOUR
+    for champion in ("recent", "volatile", "urgent"):
+        ledger.record(SOURCE, cell(champion), "15.19", [[champion, 50.0]])
+    ledger.set_priority(SOURCE, "urgent")
+
+    clock[0] += 40 * HOUR
+    names = ["recent", "old", "new", "volatile", "urgent"]
+    to_fetch, fresh = ledger.plan(SOURCE, [cell(name) for name in names], "15.19")
+
+    assert fresh == []
+    # Never fetched on the patch counts as oldest
+    assert [c.champion for c in to_fetch] == ["urgent", "volatile", "new", "old", "recent"]
+
+def test_new_patch_is_reported(ledger, clock, capsys):
+    ledger.plan(SOURCE, [], "15.19")
+    ledger.plan(SOURCE, [], "15.19")
+    assert "New patch" not in capsys.readouterr().out
+
+    ledger.plan(SOURCE, [], "15.20")
+    assert f"🆕 New patch 15.20 for {SOURCE} (was 15.19)" in capsys.readouterr().out
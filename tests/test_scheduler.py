@@ -0,0 +1,154 @@
+"""Lanes, shared budget and retries of the Riot request scheduler"""
+
+import sqlite3
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scheduler
+from scheduler import BACKFILL, INTERACTIVE, RequestScheduler
+
+class Flaky(BaseHTTPRequestHandler):
+    """Fails the first `failures` requests with `status` (and `retry_after`), then answers []"""
+    failures, status, retry_after, seen = 0, 503, None, 0
+
+    def do_GET(self):
+        type(self).seen += 1
+        failing = self.seen <= self.failures
+        body = b"" if failing else b"[]"
+        self.send_response(self.status if failing else 200)
+        if failing and self.retry_after:
+            self.send_header("Retry-After", self.retry_after)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def riot(monkeypatch, tmp_path):
+    monkeypatch.setattr(scheduler.time, "sleep", lambda seconds: None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Flaky)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    Flaky.seen, Flaky.retry_after = 0, None
+    yield f"http://127.0.0.1:{server.server_address[1]}/lol/match/v5/matches/SG2_1", RequestScheduler(tmp_path / "budget.sqlite")
+    server.shutdown()
+    server.server_close()
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_server_errors_are_retried(riot, status):
+    url, budget = riot
+    Flaky.failures, Flaky.status = 2, status
+    r = budget.get(url, lane=BACKFILL)
+    assert r.status_code == 200 and Flaky.seen == 3
+
+def test_persistent_server_error_is_returned(riot):
+    url, budget = riot
+    Flaky.failures, Flaky.status = 10, 503
+    r = budget.get(url, lane=BACKFILL)
+    assert r.status_code == 503 and Flaky.seen == scheduler.SERVER_RETRIES + 1
+
+def test_rate_limit_with_http_date_pauses_the_host(riot):
+    url, budget = riot
+    # Already passed: the host is paused until then, so the retry goes straight out
+    Flaky.failures, Flaky.status, Flaky.retry_after = 1, 429, formatdate(time.time() - 1, usegmt=True)
+    assert budget.get(url).status_code == 200 and Flaky.seen == 2
+
+def test_client_errors_are_not_retried(riot):
+    url, budget = riot
+    Flaky.failures, Flaky.status = 1, 404
+    assert budget.get(url).status_code == 404 and Flaky.seen == 1
+
+HOST = "sg2.api.riotgames.com"
+
+class Clock:
+    """Stands in for the time module: sleeping moves the clock on"""
+    START = 1_000_000.0
+
+    def __init__(self):
+        self.now = self.START
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        assert self.now - self.START < 3600, "still waiting after an hour"
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler, "time", clock)
+    return clock
+
+def most_in_window(starts, window):
+    return max(sum(1 for t in starts if start - window < t <= start) for start in starts)
+
+def test_backfill_keeps_headroom_in_every_window(clock, tmp_path):
+    budget = RequestScheduler(tmp_path / "budget.sqlite")
+    starts = []
+    for _ in range(200):
+        budget.acquire(HOST, BACKFILL)
+        starts.append(clock.now)
+
+    for limit, window in scheduler.LIMITS:
+        assert most_in_window(starts, window) == int(limit * scheduler.SHARES[BACKFILL])
+
+def test_interactive_starts_at_once_after_saturating_backfill(clock, tmp_path):
+    budget = RequestScheduler(tmp_path / "budget.sqlite")
+    for _ in range(int(20 * scheduler.SHARES[BACKFILL])):
+        budget.acquire(HOST, BACKFILL)
+
+    started = clock.now
+    budget.acquire(HOST, INTERACTIVE)
+    assert clock.now == started
+
+def test_waiting_interactive_starts_before_queued_backfill(tmp_path):
+    # One request per half second, so every start is well apart from the next
+    budget = RequestScheduler(tmp_path / "budget.sqlite", limits=[(1, 0.5)])
+    budget.pause(HOST, 0.3)
+    order, lock = [], threading.Lock()
+
+    def start(lane):
+        budget.acquire(HOST, lane)
+        with lock:
+            order.append(lane)
+
+    backfill = [threading.Thread(target=start, args=(BACKFILL,)) for _ in range(2)]
+    for thread in backfill:
+        thread.start()
+    time.sleep(0.1)  # the backfill requests are queued first
+    start(INTERACTIVE)
+    for thread in backfill:
+        thread.join()
+
+    assert order == [INTERACTIVE, BACKFILL, BACKFILL]
+
+def test_schedulers_on_one_file_share_the_budget(clock, tmp_path):
+    first = RequestScheduler(tmp_path / "budget.sqlite")
+    second = RequestScheduler(tmp_path / "budget.sqlite")
+    allowed = int(20 * scheduler.SHARES[BACKFILL])
+    for i in range(allowed):
+        (first if i % 2 else second).acquire(HOST, BACKFILL)
+    assert clock.now == Clock.START
+
+    # Over the share between them: waits for the one-second window
+    first.acquire(HOST, BACKFILL)
+    assert clock.now >= Clock.START + 1
+
+def test_stale_waiter_stops_blocking_after_ttl(clock, tmp_path):
+    path = tmp_path / "budget.sqlite"
+    budget = RequestScheduler(path)
+    # An interactive request of a process that was killed while it waited
+    killed = sqlite3.connect(path)
+    killed.execute("INSERT INTO waiting (host, lane, seen) VALUES (?, 0, ?)", (HOST, clock.now))
+    killed.commit()
+    killed.close()
+
+    started = clock.now
+    budget.acquire(HOST, BACKFILL)
+    assert scheduler.WAITER_TTL <= clock.now - started < scheduler.WAITER_TTL + scheduler.MAX_WAIT
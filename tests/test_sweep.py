@@ -0,0 +1,30 @@
+"""Parameter-matrix planning and its per-source overrides"""
+
+import pytest
+
+from sweep import plan
+
+def test_shared_build_page_is_one_item_per_source():
+    items = plan(["lolalytics_counters", "lolalytics_synergy"], champions=["ahri"], patches=["15.19"])
+    assert [i.source for i in items] == ["lolalytics_counters", "lolalytics_synergy"]
+    assert items[0].url == items[1].url
+    assert items[0].views == ["strong_against", "weak_against", "good_synergy"]
+
+def test_ugg_ranks_are_views_of_one_page():
+    [item] = plan(["ugg"], champions=["ahri"], tiers=["gold", "diamond"], patches=["15.19"])
+    assert item.views == ["gold", "diamond"]
+
+@pytest.mark.parametrize("sources, overrides", [
+    (["ugg"], {"tiers": ["diamond_plus"]}),
+    (["lolalytics_counters"], {"tiers": ["diamondplus"]}),
+    (["leagueofgraphs"], {"roles": ["bottom"]}),
+    (["lolalytics_tierlist"], {"regions": ["world"]}),
+])
+def test_unsupported_overrides_are_rejected(sources, overrides):
+    with pytest.raises(ValueError, match=sources[0]):
+        plan(sources, champions=["ahri"], patches=["15.19"], **overrides)
+
+def test_dimensions_a_source_does_not_use_are_ignored():
+    # The build page has no role in its URL, so any role collapses away
+    items = plan(["lolalytics_counters"], champions=["ahri"], roles=["adc"], patches=["15.19"])
+    assert len(items) == 1
@@ -0,0 +1,63 @@
+"""Watch mode against the local Riot API stand-in"""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import riot_api
+from player_stats import PlayerStats
+from riot_stub import RiotStub, puuid_for
+from scheduler import RequestScheduler
+
+PLAYERS = [("Faker", "KR1"), ("Keria", "KR1")]
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    # Games of a second, a second apart, each on match-v5 a second after it ends
+    server = RiotStub(PLAYERS, port=0, game_seconds=1, gap_seconds=1, match_delay=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(riot_api, "RIOT_API_BASE", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(riot_api, "PLATFORM_ROUTING", "sg2")
+    monkeypatch.setattr(riot_api, "MATCH_REGION_ROUTING", "sea")
+    monkeypatch.setattr(riot_api, "MATCH_RETRY", 0.2)
+    monkeypatch.setattr(riot_api, "scheduler", RequestScheduler(tmp_path / "budget.sqlite", limits=[(1000, 1)]))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_finished_games_are_saved_once_per_player(stub, monkeypatch, tmp_path):
+    csv_file = str(tmp_path / "matches.csv")
+    stats = PlayerStats(tmp_path / "player_stats.sqlite")
+    puuids = [puuid_for(name, tag) for name, tag in PLAYERS]
+
+    lookups = []
+    find_match = riot_api.find_match
+    def recording_find_match(match_id):
+        match = find_match(match_id)
+        lookups.append((match_id, match is not None))
+        return match
+    monkeypatch.setattr(riot_api, "find_match", recording_find_match)
+
+    # Games 0 and 1 end at 1s and 3s; their records exist from 2s and 4s
+    in_game, pending = {}, {}
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        riot_api.watch_once(puuids, in_game, pending, csv_file, stats)
+        time.sleep(0.1)
+
+    saved = pd.read_csv(csv_file)
+    assert {"SG2_1000", "SG2_1001"} <= set(saved["matchId"])
+    assert not saved.duplicated(["matchId", "puuid"]).any()
+    for match_id in set(saved["matchId"]):
+        assert sorted(saved.loc[saved["matchId"] == match_id, "puuid"]) == sorted(puuids)
+
+    # The 404 while the record did not exist yet was retried, not dropped
+    assert ("SG2_1000", False) in lookups and ("SG2_1000", True) in lookups
+
+    # Each match counted once in every player's aggregates
+    counted = stats.db.execute("SELECT COUNT(*), COUNT(DISTINCT match_id || puuid) FROM counted").fetchone()
+    assert counted[0] == counted[1] == len(saved)
+    for puuid in puuids:
+        assert stats.get(puuid)["games"].sum() == saved["matchId"].nunique()